@@ -1,6 +1,13 @@
+import os
+import sys
+
 import ollama
 import pandas as pd
 
+# Repo root on the path so the shared prompt builder can be imported from Local_LLM
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils_llm.prompt_builder import build_prompt
+
 # cd .\Local_LLM then verify with dir
 # To run model enter in terminal: ollama create baseModel -f Modelfile
 # \bye will exit chat with model
@@ -11,13 +18,7 @@ client = ollama.Client()
 df = pd.read_csv("jobs_2025-10-17-test_void.csv")
 
 def classify_job(row):
-    prompt = (
-        f"Job Title: {row['Job Title']}\n"
-        f"Company: {row['Company']}\n"
-        f"Location: {row['Location']}\n"
-        f"Description: {row['Description']}\n"
-        f"Does this job fit my criteria? Answer with 1 for yes, 0 for no."
-    )
+    prompt = build_prompt(row)
     response = client.generate(model="gemma3-4b-finetune", prompt=prompt)
     return response["response"].strip()
 
@@ -0,0 +1,80 @@
+"""
+Compares the DistilBERT inference backends on the labeled test set.
+
+Run from Local_LLM after train_distilbert.py and export_onnx.py:
+    python benchmark_distilbert.py
+
+Reports rows/sec for each backend, accuracy against the `Good` labels and the
+delta versus the PyTorch path (prediction agreement and max |prob diff|).
+"""
+
+import time
+import argparse
+
+import pandas as pd
+
+from distilbert_inference import BACKENDS, MODEL_PATH, build_text, load_model, predict
+
+TEST_PATH = "data/distilbert_test_data.csv"
+
+
+def run_backend(backend, texts, model_path, batch_size, repeats):
+    tokenizer, model = load_model(model_path, backend)
+
+    # Warm-up pass so one-off graph/session setup is not timed
+    predict(texts[:batch_size], tokenizer, model, batch_size=batch_size)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        probs = predict(texts, tokenizer, model, batch_size=batch_size)
+    elapsed = (time.perf_counter() - start) / repeats
+
+    return probs, len(texts) / elapsed
+
+
+def main(model_path, test_path, batch_size, repeats, backends):
+    df = pd.read_csv(test_path)
+    texts = build_text(df).tolist()
+    labels = df["Good"].astype(int) if "Good" in df.columns else None
+    print(f"📄 {len(texts)} rows from {test_path}")
+
+    results = {}
+    for backend in backends:
+        print(f"\n⏱️  Running {backend}...")
+        try:
+            results[backend] = run_backend(backend, texts, model_path, batch_size, repeats)
+        except (ImportError, FileNotFoundError) as e:
+            print(f"   ⚠️ Skipping {backend}: {e}")
+
+    baseline = results.get("pytorch")
+
+    print("\n" + "=" * 78)
+    print(f"{'backend':<11}{'rows/sec':>10}{'speedup':>9}{'accuracy':>10}{'agree w/ pt':>13}{'max |Δp|':>11}")
+    print("-" * 78)
+    for backend, (probs, rows_per_sec) in results.items():
+        predicted = pd.Series([int(p > 0.5) for p in probs])
+        accuracy = f"{(predicted.values == labels.values).mean():.3f}" if labels is not None else "n/a"
+
+        if baseline:
+            base_probs, base_rate = baseline
+            base_pred = [int(p > 0.5) for p in base_probs]
+            agreement = f"{(predicted.values == base_pred).mean():.3f}"
+            max_delta = f"{max(abs(a - b) for a, b in zip(probs, base_probs)):.4f}"
+            speedup = f"{rows_per_sec / base_rate:.2f}x"
+        else:
+            agreement = max_delta = speedup = "n/a"
+
+        print(f"{backend:<11}{rows_per_sec:>10.1f}{speedup:>9}{accuracy:>10}{agreement:>13}{max_delta:>11}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PyTorch vs ONNX Runtime DistilBERT inference.")
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--test-path", default=TEST_PATH)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    main(args.model_path, args.test_path, args.batch_size, args.repeats, args.backends)
@@ -0,0 +1,156 @@
+"""
+Batched inference helpers for the fine-tuned DistilBERT job classifier.
+
+Inputs are processed in windows of `window_size` rows. Inside a window the
+texts are tokenized once, sorted by token length and run in micro-batches of
+`batch_size`, each padded only to its own longest sequence. Probabilities are
+yielded back in the original input order, so memory stays bounded by the
+window size no matter how large the CSV is.
+
+Backends:
+    "pytorch"    eager PyTorch (default)
+    "onnx"       ONNX Runtime on the FP32 graph written by export_onnx.py
+    "onnx-int8"  ONNX Runtime on the dynamically quantized INT8 graph
+"""
+
+import os
+from itertools import islice
+
+import numpy as np
+import torch
+from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+MODEL_PATH = "./distilbert_jobs_model"
+BACKENDS = ("pytorch", "onnx", "onnx-int8")
+ONNX_FILES = {"onnx": "model.onnx", "onnx-int8": "model_int8.onnx"}
+BATCH_SIZE = 32
+WINDOW_SIZE = 1024
+MAX_LENGTH = 512
+
+
+def build_text(df):
+    """Combine Job Title + Description the same way the model was trained (title weighted x5)."""
+    return (df["Job Title"].fillna('') + " " +
+            df["Job Title"].fillna('') + " " +
+            df["Job Title"].fillna('') + " " +
+            df["Job Title"].fillna('') + " " +
+            df["Job Title"].fillna('') + " [SEP] " +
+            df["Description"].fillna(''))
+
+
+def onnx_path(model_path, backend):
+    """Location of the exported ONNX graph for a backend (inside the model folder)."""
+    return os.path.join(model_path, "onnx", ONNX_FILES[backend])
+
+
+class OnnxClassifier:
+    """Runs an exported DistilBERT classification graph with ONNX Runtime on CPU."""
+
+    def __init__(self, path, num_threads=None):
+        if not ONNX_AVAILABLE:
+            raise ImportError("onnxruntime is not installed. Install it with: pip install onnxruntime")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"❌ {path} not found. Run export_onnx.py first.")
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+    def predict_proba(self, input_ids, attention_mask):
+        """Returns P(good) for a padded numpy batch."""
+        logits = self.session.run(["logits"], {
+            "input_ids": input_ids.astype(np.int64),
+            "attention_mask": attention_mask.astype(np.int64),
+        })[0]
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return (exp[:, 1] / exp.sum(axis=1)).tolist()
+
+
+def load_model(model_path=MODEL_PATH, backend="pytorch"):
+    """
+    Loads the tokenizer and the model for the chosen backend.
+    The PyTorch model is returned in eval mode; ONNX backends return an OnnxClassifier.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+
+    tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
+
+    if backend == "pytorch":
+        model = DistilBertForSequenceClassification.from_pretrained(model_path)
+        model.eval()
+    else:
+        model = OnnxClassifier(onnx_path(model_path, backend))
+
+    return tokenizer, model
+
+
+def _batch_probabilities(tokenizer, model, input_ids, attention_mask):
+    """Pads one micro-batch and returns P(good) for each row."""
+    is_onnx = isinstance(model, OnnxClassifier)
+    batch = tokenizer.pad(
+        {"input_ids": input_ids, "attention_mask": attention_mask},
+        return_tensors="np" if is_onnx else "pt",
+    )
+
+    if is_onnx:
+        return model.predict_proba(batch["input_ids"], batch["attention_mask"])
+
+    with torch.inference_mode():
+        logits = model(**batch).logits
+        return torch.softmax(logits, dim=1)[:, 1].tolist()
+
+
+def _window_probabilities(texts, tokenizer, model, batch_size, max_length):
+    """Returns P(good) for one window of texts, in input order."""
+    encodings = tokenizer(texts, truncation=True, max_length=max_length)
+    input_ids = encodings["input_ids"]
+    attention_mask = encodings["attention_mask"]
+
+    # Length bucketing: neighbours in sorted order have similar lengths, so
+    # each micro-batch carries almost no padding
+    order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+    probs = [0.0] * len(texts)
+
+    for start in range(0, len(order), batch_size):
+        batch_idx = order[start:start + batch_size]
+        batch_probs = _batch_probabilities(
+            tokenizer, model,
+            [input_ids[i] for i in batch_idx],
+            [attention_mask[i] for i in batch_idx],
+        )
+
+        for i, p in zip(batch_idx, batch_probs):
+            probs[i] = p
+
+    return probs
+
+
+def predict_stream(texts, tokenizer, model, batch_size=BATCH_SIZE, window_size=WINDOW_SIZE, max_length=MAX_LENGTH):
+    """
+    Yields the probability of being "Good" (1) for each text, in input order.
+
+    Args:
+        texts: Any iterable of strings (list, Series, generator)
+        batch_size: Rows per forward pass
+        window_size: Rows tokenized and length-sorted together (bounds memory)
+        max_length: Token truncation length
+    """
+    iterator = iter(texts)
+    while True:
+        window = list(islice(iterator, window_size))
+        if not window:
+            return
+        yield from _window_probabilities(window, tokenizer, model, batch_size, max_length)
+
+
+def predict(texts, tokenizer, model, **kwargs):
+    """Returns a list of P(good) for all texts (see predict_stream for options)."""
+    return list(predict_stream(texts, tokenizer, model, **kwargs))
@@ -0,0 +1,65 @@
+"""
+Exports the fine-tuned DistilBERT classifier to ONNX and writes a dynamically
+quantized INT8 copy for fast CPU inference.
+
+Run from Local_LLM after train_distilbert.py:
+    python export_onnx.py
+
+Outputs (next to the PyTorch weights):
+    distilbert_jobs_model/onnx/model.onnx        FP32 graph
+    distilbert_jobs_model/onnx/model_int8.onnx   INT8 weights (dynamic quantization)
+"""
+
+import os
+import argparse
+
+import torch
+from onnxruntime.quantization import quantize_dynamic, QuantType
+from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
+
+from distilbert_inference import MODEL_PATH, onnx_path
+
+
+def export(model_path=MODEL_PATH, opset=17):
+    tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
+    model = DistilBertForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+
+    fp32_path = onnx_path(model_path, "onnx")
+    int8_path = onnx_path(model_path, "onnx-int8")
+    os.makedirs(os.path.dirname(fp32_path), exist_ok=True)
+
+    # Example input only fixes the graph structure; batch and sequence axes stay dynamic
+    sample = tokenizer(["Director of Sales [SEP] Asset management leadership role"], return_tensors="pt")
+
+    print(f"🔄 Exporting {model_path} to {fp32_path}...")
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        fp32_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        opset_version=opset,
+        dynamo=False,
+    )
+
+    print(f"🔄 Quantizing weights to INT8: {int8_path}...")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    for path in (fp32_path, int8_path):
+        print(f"   {path}: {os.path.getsize(path) / 1e6:.1f} MB")
+    print("✅ Export complete. Use --backend onnx or --backend onnx-int8 in run_distilbert.py")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the DistilBERT job classifier to ONNX (+ INT8).")
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+
+    export(args.model_path, args.opset)
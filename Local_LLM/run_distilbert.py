@@ -1,32 +1,27 @@
-from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
-import torch
+import argparse
+
 import pandas as pd
 
+from distilbert_inference import BACKENDS, build_text, load_model, predict_stream
+
+parser = argparse.ArgumentParser(description="Score the test CSV with the DistilBERT job classifier.")
+parser.add_argument("--backend", default="pytorch", choices=BACKENDS,
+                    help="pytorch, or onnx / onnx-int8 after running export_onnx.py")
+args = parser.parse_args()
+
 model_path = "./distilbert_jobs_model"
-tokenizer = DistilBertTokenizerFast.from_pretrained(model_path)
-model = DistilBertForSequenceClassification.from_pretrained(model_path)
+tokenizer, model = load_model(model_path, backend=args.backend)
+print(f"🧠 Using {args.backend} backend")
 
 # Load your test CSV (with blank Good column)
 test_path = "data/distilbert_test_data.csv"
 df = pd.read_csv(test_path)
 
 # Combine Job Title + Description
-df["text"] = (df["Job Title"].fillna('') + " " +
-              df["Job Title"].fillna('') + " " +
-              df["Job Title"].fillna('') + " " +
-              df["Job Title"].fillna('') + " " +
-              df["Job Title"].fillna('') + " [SEP] " +
-              df["Description"].fillna(''))
-
-def predict(texts):
-    inputs = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
-    with torch.no_grad():
-        outputs = model(**inputs)
-        probs = torch.softmax(outputs.logits, dim=1)
-        return probs[:, 1].tolist()  # Probability of being "Good" (1)
-
-# Run predictions
-df["prob_good"] = predict(df["text"].tolist())
+df["text"] = build_text(df)
+
+# Run predictions in length-bucketed micro-batches (bounded memory, minimal padding)
+df["prob_good"] = list(predict_stream(df["text"], tokenizer, model, batch_size=32))
 df["predicted_good"] = (df["prob_good"] > 0.5).astype(int)
 
 # Save with predictions
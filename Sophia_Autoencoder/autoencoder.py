@@ -2,7 +2,7 @@ import pandas as pd
 import torch
 from torch import nn
 from sklearn.preprocessing import StandardScaler
-from sentence_transformers import SentenceTransformer
+from embedding_store import EmbeddingStore
 import os
 
 #  LOAD TRAIN AND TEST DATA
@@ -29,12 +29,15 @@ train_texts = ((train_df["Job Title"] + " ") * 5 + SEP + train_df["Description"]
 test_texts = ((test_df["Job Title"] + " ") * 5 + SEP + test_df["Description"]).astype(str).tolist()
 print(f"🧾 Loaded {len(train_texts)} train and {len(test_texts)} test job descriptions")
 
-# ENCODE USING MiniLM
+# ENCODE USING MiniLM (cached: only texts not seen in earlier runs are encoded)
 
 print("\n🔍 Generating embeddings with all-MiniLM-L6-v2...")
-model = SentenceTransformer("all-MiniLM-L6-v2")
-train_embeddings = model.encode(train_texts, batch_size=16, show_progress_bar=True)
-test_embeddings = model.encode(test_texts, batch_size=16, show_progress_bar=True)
+# Repo-level data/embeddings (gitignored), wherever the script is run from
+store_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "embeddings")
+store = EmbeddingStore("all-MiniLM-L6-v2", root=os.path.normpath(store_root))
+train_embeddings = store.encode(train_texts, batch_size=16, show_progress_bar=True)
+test_embeddings = store.encode(test_texts, batch_size=16, show_progress_bar=True)
+store.close()
 
 scaler = StandardScaler()
 train_embeddings = scaler.fit_transform(train_embeddings)
@@ -0,0 +1,126 @@
+"""
+Persistent embedding store for job-description embeddings.
+
+Embeddings are kept in one memory-mapped float32 matrix per model
+(`<root>/<model>/vectors.f32`) with a SQLite id index mapping
+sha256(text) -> row. Only texts that are not in the store yet are encoded, so
+re-running an experiment skips the SentenceTransformer step (and even loading
+the model) entirely.
+
+Any script can reuse it:
+    from Sophia_Autoencoder.embedding_store import EmbeddingStore
+    store = EmbeddingStore("all-MiniLM-L6-v2")
+    X = store.encode(texts)   # (len(texts), dim) float32
+"""
+
+import os
+import re
+import sqlite3
+import hashlib
+
+import numpy as np
+
+DEFAULT_STORE_DIR = os.path.join("data", "embeddings")
+
+
+def text_hash(text):
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Append-only embedding store for a single embedding model.
+
+    Args:
+        model_name: SentenceTransformer model name (also used to load it lazily)
+        root: Directory holding one sub-folder per model
+    """
+
+    def __init__(self, model_name, root=DEFAULT_STORE_DIR):
+        self.model_name = model_name
+        self.directory = os.path.join(root, re.sub(r"[^A-Za-z0-9._-]+", "_", model_name))
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self._conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"))
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ids (text_hash TEXT PRIMARY KEY, model TEXT NOT NULL, row INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+        dim = self._conn.execute("SELECT value FROM meta WHERE key='dim'").fetchone()
+        self.dim = int(dim[0]) if dim else None
+        self._encoder = None
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM ids").fetchone()[0]
+
+    def _stored_rows(self):
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (self.dim * 4)
+
+    def _matrix(self):
+        """Read-only memory map over every stored vector."""
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._stored_rows(), self.dim))
+
+    def _get_encoder(self):
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+            print(f"🔍 Loading embedding model {self.model_name}...")
+            self._encoder = SentenceTransformer(self.model_name)
+        return self._encoder
+
+    def _append(self, hashes, vectors):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(self.dim),))
+
+        # Vectors are written before the index rows, so a crash can only leave
+        # unreferenced rows at the end of the file, never dangling ids
+        first_row = self._stored_rows()
+        with open(self.vectors_path, "ab") as f:
+            # Drop a partial vector left by a crash, so new rows start at first_row
+            f.truncate(first_row * self.dim * 4)
+            f.write(vectors.tobytes())
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO ids VALUES (?, ?, ?)",
+            [(h, self.model_name, first_row + i) for i, h in enumerate(hashes)]
+        )
+        self._conn.commit()
+
+    def encode(self, texts, batch_size=16, show_progress_bar=True):
+        """
+        Returns embeddings for texts as a (len(texts), dim) float32 array,
+        encoding and storing only texts that are not already in the store.
+        """
+        texts = [str(t) for t in texts]
+        hashes = [text_hash(t) for t in texts]
+
+        rows = dict(self._conn.execute("SELECT text_hash, row FROM ids").fetchall())
+
+        missing = {}
+        for h, t in zip(hashes, texts):
+            if h not in rows and h not in missing:
+                missing[h] = t
+
+        print(f"🗃️  Embedding store: {len(texts) - sum(1 for h in hashes if h in missing)} cached, "
+              f"{len(missing)} new texts to encode")
+
+        if missing:
+            vectors = self._get_encoder().encode(list(missing.values()), batch_size=batch_size,
+                                                 show_progress_bar=show_progress_bar)
+            self._append(list(missing.keys()), vectors)
+            rows = dict(self._conn.execute("SELECT text_hash, row FROM ids").fetchall())
+
+        if not texts:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+
+        # Fancy indexing copies just the requested rows out of the memory map
+        return np.asarray(self._matrix()[[rows[h] for h in hashes]])
+
+    def close(self):
+        self._conn.close()
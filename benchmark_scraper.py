@@ -0,0 +1,133 @@
+"""
+Scraper throughput benchmark against recorded Indeed fixtures.
+
+1. Record fixtures once from the live site (opens a real browser):
+       python benchmark_scraper.py --record --companies 3
+2. Replay them from a local HTTP server and measure throughput:
+       python benchmark_scraper.py --companies 3
+
+Reports jobs/sec plus per-stage time for scroll_and_load_jobs, card
+extraction (parse_job_cards) and extract_job_description, and bytes
+transferred / load time per page. Compare --block-resources against a
+plain run (live pages, with --record) to measure resource blocking.
+"""
+
+import time
+import argparse
+import functools
+
+import utils_indeed.scrape_indeed_jobs as scraper
+from utils_indeed.indeed_driver import init_driver
+from utils_indeed.fixtures import FixtureServer, RecordingDriver, DEFAULT_FIXTURE_DIR
+from utils_indeed.wait_policy import WaitPolicy
+from indeed_pipeline_main import COMPANIES, TITLES, KEYWORDS, EXCLUDE_KEYWORDS
+
+# Stages timed by wrapping the functions search_jobs_for_company looks up at call time
+TIMED_STAGES = {
+    "scroll_and_load_jobs": "scroll_and_load_jobs",
+    "card extraction": "parse_job_cards",
+    "extract_job_description": "extract_job_description",
+}
+
+
+def install_stage_timers():
+    """Wraps each timed stage in the scraper module. Returns {stage: [durations]}."""
+    timings = {stage: [] for stage in TIMED_STAGES}
+
+    for stage, func_name in TIMED_STAGES.items():
+        original = getattr(scraper, func_name)
+
+        @functools.wraps(original)
+        def timed(*args, _original=original, _stage=stage, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _original(*args, **kwargs)
+            finally:
+                timings[_stage].append(time.perf_counter() - start)
+
+        setattr(scraper, func_name, timed)
+
+    return timings
+
+
+def print_report(timings, total_jobs, wall_time, page_stats=None):
+    print("\n" + "=" * 60)
+    print("📊 SCRAPER BENCHMARK")
+    print("=" * 60)
+    print(f"Jobs scraped:   {total_jobs}")
+    print(f"Wall time:      {wall_time:.2f}s")
+    print(f"Throughput:     {total_jobs / wall_time if wall_time else 0:.2f} jobs/sec")
+    print("\nPer-stage time:")
+    for stage, durations in timings.items():
+        total = sum(durations)
+        mean = total / len(durations) if durations else 0.0
+        share = total / wall_time * 100 if wall_time else 0.0
+        print(f"   {stage:<26} calls={len(durations):<4} total={total:8.2f}s "
+              f"mean={mean:6.3f}s ({share:4.1f}% of wall)")
+    if page_stats is not None:
+        page_stats.print_summary()
+    print("=" * 60)
+
+
+def run_benchmark(companies, fixture_dir, record=False, max_results=20, max_descriptions=20, headless=True,
+                  block_resources=False):
+    timings = install_stage_timers()
+    driver = init_driver(headless=headless, block_resources=block_resources)
+    page_stats = driver.page_stats
+    server = None
+
+    if record:
+        print(f"🎥 Recording live pages to {fixture_dir}")
+        driver = RecordingDriver(driver, fixture_dir)
+        base_url = None
+        wait_policy = WaitPolicy()  # Live site: keep the polite request rate
+    else:
+        server = FixtureServer(fixture_dir).start()
+        base_url = server.base_url
+        wait_policy = WaitPolicy.for_fixtures()  # Local replay: run at I/O speed
+
+    total_jobs = 0
+    start = time.perf_counter()
+    try:
+        for company in companies:
+            print(f"\n--- Benchmarking: {company} ---")
+            jobs = scraper.search_jobs_for_company(
+                driver, company, TITLES, KEYWORDS, EXCLUDE_KEYWORDS,
+                max_results=max_results, max_descriptions=max_descriptions, base_url=base_url,
+                wait_policy=wait_policy
+            )
+            total_jobs += len(jobs)
+    finally:
+        wall_time = time.perf_counter() - start
+        driver.quit()
+        if server is not None:
+            server.stop()
+
+    if record:
+        print(f"\n🎥 Recorded {len(driver.recorded)} pages to {fixture_dir}")
+
+    print_report(timings, total_jobs, wall_time, page_stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Indeed scraper against recorded fixtures.")
+    parser.add_argument("--record", action="store_true", help="Record fixtures from the live site instead")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURE_DIR, help="Fixture directory")
+    parser.add_argument("--companies", type=int, default=3, help="Number of companies from COMPANIES to use")
+    parser.add_argument("--max-results", type=int, default=20)
+    parser.add_argument("--max-descriptions", type=int, default=20)
+    parser.add_argument("--show-browser", action="store_true",
+                        help="Run Chrome with a visible window (always on when recording, for Cloudflare)")
+    parser.add_argument("--block-resources", action="store_true",
+                        help="Block images, fonts, media and trackers (see utils_pipeline/browser_resources.py)")
+    args = parser.parse_args()
+
+    run_benchmark(
+        COMPANIES[:args.companies],
+        args.fixtures,
+        record=args.record,
+        max_results=args.max_results,
+        max_descriptions=args.max_descriptions,
+        headless=not (args.show_browser or args.record),
+        block_resources=args.block_resources,
+    )
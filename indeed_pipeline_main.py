@@ -1,13 +1,33 @@
 import os
+import glob
 import time
+import queue
+import argparse
+import functools
 import datetime
+import threading
 import pandas as pd
-import ollama
 
 # --- IMPORT YOUR UTILS ---
 # Ensure 'utils_indeed' folder exists with __init__.py inside
 from utils_indeed.indeed_driver import init_driver
 from utils_indeed.scrape_indeed_jobs import search_jobs_for_company
+from utils_indeed.job_index import JobIndex, extract_job_key
+from utils_indeed.wait_policy import WaitPolicy
+from utils_indeed.triage import Triage
+from utils_llm.client_pool import ClientPool
+from utils_llm.ollama_engine import create_client, classify_dataframe, generate_label, preload_model
+from utils_llm.prompt_builder import build_prompt, tokenizer_id
+from utils_llm.classification_cache import ClassificationCache, system_prompt_digest
+from utils_llm.cascade import (score_with_distilbert, in_uncertainty_band, auto_labels,
+                               STAGE_DISTILBERT, STAGE_LLM, STAGE_RULES)
+from utils_pipeline.run_journal import RunJournal, row_hash
+from utils_pipeline.title_rules import TitleRules
+from utils_pipeline.scroll_stop import disabled_reason
+from utils_pipeline.tracing import span, start_trace, stop_trace, summarize_trace, DEFAULT_TRACE_DIR
+from utils_pipeline.job_store import JobStore, PYARROW_AVAILABLE, JOB_COLUMNS
+from utils_pipeline.company_scheduler import (CompanyPlan, load_company_history, plan_companies, list_order_plan,
+                                              print_plan)
 
 # ==============================================================================
 # CONFIGURATION
@@ -35,8 +55,77 @@ KEYWORDS = [
 
 EXCLUDE_KEYWORDS = ["intern", "internship"]
 
+# Title rules re-applied (vectorized) to every row before classification, e.g. for
+# --classify-only backfills of unfiltered CSVs. Rejected rows are labeled 0 without a
+# model call; "Rule Fired" records which rule decided. None disables it.
+PRECLASSIFY_RULES = TitleRules(TITLES, EXCLUDE_KEYWORDS)
+
+# Minimum seconds between page loads (+ random jitter) to keep scraping polite
+WAIT_POLICY = WaitPolicy(min_request_interval=6.0, request_jitter=4.0)
+
+# Crawl companies best-first by historical yield (good jobs per browser-minute from past
+# runs' journals, traces and classified CSVs), with result/description budgets scaled by
+# yield. False = COMPANIES in list order with 20 results each
+SCHEDULE_BY_YIELD = True
+RUN_TIME_BUDGET_MINUTES = 120  # Global browser-time budget for the scrape (None = no limit)
+
+# Skip images and tracking scripts while scraping (challenge hosts in
+# browser_resources.DEFAULT_ALLOWLIST still load). Bytes and load times per page are
+# printed per company and at the end of the scrape either way, for comparison
+BLOCK_RESOURCES = True
+
+# Triage: score each card's title/company/location before opening its detail page;
+# cards below the threshold are skipped and logged with the reason for recall audits
+USE_TRIAGE = True
+TRIAGE_THRESHOLD = 0.35
+TRIAGE_AUDIT_CSV = os.path.join("data", "triage_skipped.csv")
+
 MODEL_NAME = "gemma3-4b-finetune"  # gemma3-4b-finetune or baseModel_gemma (12b param)
 
+OLLAMA_HOST = None            # None = default local server (http://localhost:11434)
+OLLAMA_HOSTS = []             # Several servers to load balance over, e.g. ["http://127.0.0.1:11434", "http://127.0.0.1:11435"]
+CLASSIFY_CONCURRENCY = 4      # Max in-flight Ollama requests (OLLAMA_NUM_PARALLEL x number of hosts)
+REQUEST_TIMEOUT = 120         # Seconds before a single classification request is abandoned
+
+# Constrained decoding: the model may only answer 0 or 1 (JSON schema format) and stops
+# after three tokens at most; KEEP_ALIVE keeps it loaded between requests and runs
+CONSTRAINED_DECODING = True
+KEEP_ALIVE = "30m"
+
+USE_CLASSIFICATION_CACHE = True                                   # Skip the model for prompts seen before
+MODELFILE_PATH = os.path.join("Fine-Tuning", "Modelfile_gemma4b")  # SYSTEM prompt used for cache keys
+
+# Cascade mode: DistilBERT scores every row first; only rows with prob_good inside
+# CASCADE_BAND go to the Ollama model, the rest are auto-labeled
+USE_CASCADE = False
+CASCADE_BAND = (0.1, 0.9)
+DISTILBERT_MODEL_PATH = os.path.join("Local_LLM", "distilbert_jobs_model")
+DISTILBERT_BACKEND = "pytorch"  # pytorch, onnx or onnx-int8 (see Local_LLM/export_onnx.py)
+
+# Streaming mode: classify each company's jobs while the browser scrapes the next
+# company, instead of running the two phases back to back
+STREAMING_MODE = False
+STREAM_QUEUE_SIZE = 4  # Max scraped company batches waiting for the classifier
+
+# Chunked classification (--classify-only): input CSVs are read and classified this
+# many rows at a time, so memory stays flat no matter how large the inputs are
+CLASSIFY_CHUNK_SIZE = 500
+
+# Incremental mode: only scrape/classify postings not seen in previous runs and
+# merge every run's predictions into one cumulative dataset
+INCREMENTAL_MODE = True
+CUMULATIVE_CSV = os.path.join("data", "indeed_jobs_cumulative.csv")
+
+# Span tracing: per-stage timings written to data/traces/<run-id>.jsonl and summarized
+# (p50/p95/total per stage and company) at the end of the run
+ENABLE_TRACING = True
+TRACE_DIR = DEFAULT_TRACE_DIR
+
+# Raw batches also go to a partitioned Parquet job store (python -m utils_pipeline.job_store);
+# the run's raw CSV is still appended per batch (streaming mode and --resume rely on it)
+USE_JOB_STORE = True
+JOB_STORE_DIR = os.path.join("data", "job_store")
+
 def get_unique_filename(base_path="data", prefix="indeed_jobs"):
     """Generates a unique filename with a timestamp."""
     os.makedirs(base_path, exist_ok=True)
@@ -53,6 +142,51 @@ def get_unique_filename(base_path="data", prefix="indeed_jobs"):
         counter += 1
 
 
+def merge_into_cumulative(df, cumulative_path):
+    """
+    Merges newly classified rows into the cumulative dataset.
+    Rows are de-duplicated on Job URL, keeping the newest prediction.
+    """
+    if df.empty:
+        return
+
+    if os.path.exists(cumulative_path):
+        existing = pd.read_csv(cumulative_path)
+        df = pd.concat([existing, df], ignore_index=True)
+        df = df.drop_duplicates(subset=["Job URL"], keep="last")
+
+    try:
+        df.to_csv(cumulative_path, index=False)
+        print(f"📚 Cumulative dataset now holds {len(df)} jobs: {cumulative_path}")
+    except PermissionError:
+        print(f"❌ CRITICAL: Could not save to {cumulative_path} (Permission Denied).")
+
+
+def run_name(csv_filename):
+    """Name a run's rows are stored under in the job store (the raw CSV's base name)."""
+    return os.path.splitext(os.path.basename(csv_filename))[0]
+
+
+def open_job_store():
+    """Returns the JobStore, or None when it is disabled or pyarrow is missing."""
+    if not USE_JOB_STORE:
+        return None
+    if not PYARROW_AVAILABLE:
+        print("⚠️  pyarrow not installed, raw batches are saved to CSV only (pip install pyarrow)")
+        return None
+    return JobStore(JOB_STORE_DIR)
+
+
+def load_scraped_jobs(csv_filename):
+    """Reads a run's scraped jobs from the job store if it holds them, else from the raw CSV."""
+    job_store = open_job_store()
+    if job_store is not None:
+        df = job_store.read_run(run_name(csv_filename))
+        if not df.empty:
+            return df
+    return pd.read_csv(csv_filename)
+
+
 def save_batch_to_csv(jobs_list, filename):
 
     if not jobs_list:
@@ -72,44 +206,146 @@ def save_batch_to_csv(jobs_list, filename):
 # PHASE 1: SCRAPING
 # ==============================================================================
 
-def run_scraping_phase():
-    """Runs the Indeed scraper and returns the path of the saved CSV."""
+def schedule_companies():
+    """Crawl plan for this run: CompanyPlan per company, in crawl order."""
+    if not SCHEDULE_BY_YIELD:
+        return list_order_plan(COMPANIES)
+
+    classified = [CUMULATIVE_CSV, os.path.join("data", "*_CLASSIFIED.csv")]
+    history = load_company_history(COMPANIES, trace_dir=TRACE_DIR, classified_globs=classified)
+    plans = plan_companies(COMPANIES, history, RUN_TIME_BUDGET_MINUTES)
+    print_plan(plans, RUN_TIME_BUDGET_MINUTES)
+    return plans
+
+
+def run_scraping_phase(job_index=None, on_batch=None, csv_filename=None, journal=None):
+    """
+    Runs the Indeed scraper and returns the path of the saved CSV.
+    With a JobIndex, postings from previous runs are skipped and new ones are recorded.
+    on_batch, if given, is called with each company's jobs right after they are saved.
+    With a RunJournal, companies finished by an earlier attempt of the run are
+    skipped and each finished company is journaled.
+    """
     print("\n" + "=" * 60)
     print("PHASE 1: INITIATING JOB SCRAPER")
     print("=" * 60)
 
-    driver = init_driver(headless=False)
-    csv_filename = get_unique_filename()
+    if journal is not None:
+        if journal.scrape_finished:
+            print(f"⏩ Run {journal.run_id} already finished scraping: {journal.raw_csv}")
+            return journal.raw_csv
+        journal.restore_raw_csv()
+        csv_filename = csv_filename or journal.raw_csv
+
+    csv_filename = csv_filename or get_unique_filename()
+    if journal is not None:
+        journal.start(csv_filename)
+
+    job_store = open_job_store()
+    if job_store is not None and journal is not None:
+        # Drop a batch stored just before a crash; its company is scraped again
+        job_store.discard_run(run_name(csv_filename), keep_companies=journal.completed_companies)
+
+    driver = init_driver(headless=False, block_resources=BLOCK_RESOURCES)
     print(f"📁 Target File: {csv_filename}")
+    if job_store is not None:
+        print(f"🗃️  Job store: {job_store.root} (run '{run_name(csv_filename)}')")
+    if job_index is not None:
+        print(f"🗂️  Incremental mode: {len(job_index)} previously scraped jobs will be skipped")
+    scroll_stop_off = disabled_reason(TitleRules(TITLES, EXCLUDE_KEYWORDS))
+    if scroll_stop_off:
+        print(f"ℹ️  Adaptive scroll stop disabled ({scroll_stop_off}); scrolling runs to max_results")
+
+    triage = Triage(TRIAGE_THRESHOLD, TRIAGE_AUDIT_CSV) if USE_TRIAGE else None
+
+    if journal is not None and journal.schedule is not None:
+        # Resumed run: the same order and budgets as the interrupted attempt
+        plans = [CompanyPlan(**plan) for plan in journal.schedule]
+        time_budget = journal.time_budget_minutes
+        print(f"📅 Replaying the journaled schedule ({len(plans)} companies)")
+    else:
+        plans = schedule_companies()
+        time_budget = RUN_TIME_BUDGET_MINUTES
+        if journal is not None:
+            journal.schedule_planned(plans, time_budget)
+
+    # Hard stop for the whole crawl: companies left when the budget runs out are not searched.
+    # Minutes already spent by an interrupted attempt count against the budget
+    spent = journal.spent_minutes if journal is not None else 0.0
+    deadline = time.monotonic() + (time_budget - spent) * 60 if time_budget else None
+    over_budget = []
 
     total_jobs_found = 0
+    finished = False
 
     try:
-        for company in COMPANIES:
-            print(f"\n--- Scraping: {company} ---")
-
-            jobs = search_jobs_for_company(
-                driver,
-                company,
-                TITLES,
-                KEYWORDS,
-                EXCLUDE_KEYWORDS,
-                max_results=20,
-                max_descriptions=20
-            )
+        for plan in plans:
+            company = plan.company
+            if journal is not None and company in journal.completed_companies:
+                print(f"\n⏩ Skipping {company} (finished before the run was interrupted)")
+                continue
+
+            if deadline is not None and time.monotonic() >= deadline:
+                over_budget.append(company)
+                continue
+
+            print(f"\n--- Scraping: {company} (up to {plan.max_results} results) ---")
+
+            # Every span recorded inside (page loads, scrolls, detail pages) is tagged with the company
+            search_start = time.monotonic()
+            with span("search_company", company=company, max_results=plan.max_results) as attrs:
+                jobs = search_jobs_for_company(
+                    driver,
+                    company,
+                    TITLES,
+                    KEYWORDS,
+                    EXCLUDE_KEYWORDS,
+                    max_results=plan.max_results,
+                    max_descriptions=plan.max_descriptions,
+                    known_job_ids=job_index,
+                    wait_policy=WAIT_POLICY,
+                    triage=triage
+                )
+                attrs["jobs"] = len(jobs)
 
             if jobs:
-                save_batch_to_csv(jobs, csv_filename)
+                with span("save_batch", company=company):
+                    if job_store is not None:
+                        job_store.write_batch(jobs, run_name(csv_filename), search_company=company)
+                        print(f"   💾 Stored batch of {len(jobs)} jobs in {job_store.root}")
+                    save_batch_to_csv(jobs, csv_filename)
                 total_jobs_found += len(jobs)
 
-            time.sleep(3)  # Polite delay between companies
+            # Journaled before the job index is updated, so a crash in between
+            # can only make a later run re-scrape these jobs, never lose them
+            if journal is not None:
+                csv_bytes = os.path.getsize(csv_filename) if os.path.exists(csv_filename) else 0
+                journal.company_done(company, [extract_job_key(job.get("Job URL")) for job in jobs], csv_bytes,
+                                     minutes=(time.monotonic() - search_start) / 60)
+
+            if jobs:
+                if job_index is not None:
+                    job_index.add_jobs(jobs)
+                if on_batch is not None:
+                    on_batch(jobs)
+
+            # No fixed delay between companies: WAIT_POLICY spaces out the next search
+
+        finished = True
 
     except Exception as e:
         print(f"\n⚠️  Scraping interrupted: {e}")
     finally:
+        driver.page_stats.print_summary()
         print("\nClosing browser...")
         driver.quit()
 
+    if finished and journal is not None:
+        journal.scrape_done()
+
+    if over_budget:
+        print(f"\n⏰ Time budget of {time_budget} min reached; not searched: {', '.join(over_budget)}")
+
     print(f"\n✅ SCRAPE COMPLETE. Collected {total_jobs_found} jobs.")
     return csv_filename
 
@@ -118,28 +354,142 @@ def run_scraping_phase():
 # PHASE 2: CLASSIFICATION
 # ==============================================================================
 
-def classify_job_row(client, row):
-    """Sends a single job row to Ollama for classification."""
-    # Construct the prompt
-    prompt = (
-        f"Job Title: {row['Job Title']}\n"
-        f"Company: {row['Company']}\n"
-        f"Location: {row['Location']}\n"
-        f"Description: {row['Description']}\n"
-        f"Does this job fit my criteria? Answer with 1 for yes, 0 for no."
-    )
-
-    try:
-        # Call the model
-        response = client.generate(model=MODEL_NAME, prompt=prompt)
-        return response["response"].strip()
-    except Exception as e:
-        print(f"   ⚠️ Model error on job '{row.get('Job Title', 'Unknown')}': {e}")
-        return "Error"
-
-
-def run_classification_phase(input_csv_path):
-    """Loads the scraped CSV and runs the LLM classifier."""
+def classify_job_row(client, row, cache=None):
+    """Sends a single job row to Ollama for classification (answered from cache when possible)."""
+    with span("classify_row", company=row.get("Company")) as attrs:
+        # Construct the prompt (boilerplate stripped, description cut to the training token budget)
+        with span("build_prompt"):
+            prompt = build_prompt(row)
+
+        if cache is not None:
+            cached = cache.get(prompt)
+            if cached is not None:
+                attrs["cache"] = "hit"
+                return cached
+            attrs["cache"] = "miss"
+
+        try:
+            # Call the model
+            if CONSTRAINED_DECODING:
+                prediction = generate_label(client, MODEL_NAME, prompt, keep_alive=KEEP_ALIVE)
+            else:
+                with span("ollama_generate"):
+                    response = client.generate(model=MODEL_NAME, prompt=prompt)
+                prediction = response["response"].strip()
+        except Exception as e:
+            print(f"   ⚠️ Model error on job '{row.get('Job Title', 'Unknown')}': {e}")
+            attrs["error"] = str(e)
+            return "Error"
+
+        # Errors are never cached so they get retried on the next run
+        if cache is not None:
+            cache.put(prompt, prediction)
+
+        return prediction
+
+
+def relevant_mask(predictions):
+    """Rows classified as relevant: exactly "1" with constrained decoding, else any answer containing a 1."""
+    if CONSTRAINED_DECODING:
+        return predictions.astype(str) == "1"
+    # .contains('1') is robust against free-form answers like "1 ", "1\n", etc.
+    return predictions.astype(str).str.contains('1', na=False)
+
+
+def classify_journaled_row(client, row, classify_fn, journal):
+    """Reuses the prediction journaled for this row by an earlier attempt of the run, else classifies and journals it."""
+    key = row_hash(row)
+    if key in journal.predictions:
+        return journal.predictions[key]
+
+    prediction = classify_fn(client, row)
+    if prediction != "Error":
+        journal.classified(key, prediction)
+    return prediction
+
+
+def init_classifier():
+    """Creates the Ollama client and, if enabled, the classification cache."""
+    client = create_client(host=OLLAMA_HOST, request_timeout=REQUEST_TIMEOUT, hosts=OLLAMA_HOSTS)
+    # Quick health check (optional)
+    # client.list()
+    print(f"⚡ Up to {CLASSIFY_CONCURRENCY} requests in flight (timeout {REQUEST_TIMEOUT}s each)")
+    if CONSTRAINED_DECODING:
+        preload_model(client, MODEL_NAME, keep_alive=KEEP_ALIVE)
+        print(f"🎯 Constrained 0/1 decoding, model kept loaded for {KEEP_ALIVE}")
+
+    cache = None
+    if USE_CLASSIFICATION_CACHE:
+        digest = system_prompt_digest(MODELFILE_PATH, client=client, model_name=MODEL_NAME)
+        if CONSTRAINED_DECODING:
+            digest += ":label01"  # Free-form answers cached earlier are not exact labels
+        # Prompts cut with the character fallback differ from tokenizer-cut ones
+        digest += f":budget={tokenizer_id()}"
+        cache = ClassificationCache(MODEL_NAME, digest)
+        print(f"🗄️  Classification cache: {cache.path} ({len(cache)} entries)")
+
+    return client, cache
+
+
+def close_classifier(client, cache):
+    """Prints the cache / host pool statistics and closes the cache."""
+    if isinstance(client, ClientPool):
+        print(f"🌐 Hosts: {client.summary()}")
+    if cache is not None:
+        print(f"🗄️  Cache: {cache.summary()}")
+        cache.close()
+
+
+def predict_jobs(df, client, cache=None, journal=None):
+    """
+    Adds the "Predicted" column to df. In cascade mode also adds "prob_good"
+    and "Decided By" (which stage labeled the row).
+    """
+    classify_fn = functools.partial(classify_job_row, cache=cache)
+    if journal is not None:
+        classify_fn = functools.partial(classify_journaled_row, classify_fn=classify_fn, journal=journal)
+
+    accepted = pd.Series(True, index=df.index)
+    if PRECLASSIFY_RULES is not None:
+        verdicts = PRECLASSIFY_RULES.evaluate_series(df["Job Title"])
+        df["Rule Fired"] = verdicts["rule"]
+        accepted = verdicts["accepted"]
+        if not accepted.all():
+            print(f"📏 Title rules rejected {int((~accepted).sum())} rows (labeled 0 without the model)")
+
+    if not USE_CASCADE:
+        # Rows are classified concurrently and reassembled in their original order
+        df["Predicted"] = "0"
+        if accepted.any():
+            df.loc[accepted, "Predicted"] = classify_dataframe(df[accepted], classify_fn, client,
+                                                               max_concurrency=CLASSIFY_CONCURRENCY)
+        return df
+
+    df["prob_good"] = score_with_distilbert(df, DISTILBERT_MODEL_PATH, DISTILBERT_BACKEND)
+    uncertain = in_uncertainty_band(df["prob_good"], CASCADE_BAND) & accepted
+
+    df["Predicted"] = auto_labels(df["prob_good"], CASCADE_BAND)
+    df["Decided By"] = STAGE_DISTILBERT
+    df.loc[~accepted, "Predicted"] = "0"
+    df.loc[~accepted, "Decided By"] = STAGE_RULES
+
+    print(f"🪜 Cascade: {int((~uncertain & accepted).sum())} rows auto-labeled by DistilBERT, "
+          f"{int(uncertain.sum())} sent to {MODEL_NAME}")
+
+    if uncertain.any():
+        df.loc[uncertain, "Predicted"] = classify_dataframe(df[uncertain], classify_fn, client,
+                                                            max_concurrency=CLASSIFY_CONCURRENCY)
+        df.loc[uncertain, "Decided By"] = STAGE_LLM
+
+    return df
+
+
+def run_classification_phase(input_csv_path, cumulative_csv=None, journal=None):
+    """
+    Loads the scraped CSV and runs the LLM classifier.
+    If cumulative_csv is given, all predictions are also merged into that dataset.
+    With a RunJournal, rows classified by an earlier attempt of the run are not sent again.
+    """
     print("\n" + "=" * 60)
     print("PHASE 2: INITIATING AI CLASSIFICATION")
     print("=" * 60)
@@ -148,9 +498,13 @@ def run_classification_phase(input_csv_path):
         print("❌ Error: Scraped file not found. Skipping classification.")
         return
 
+    if journal is not None and journal.classify_finished and os.path.exists(journal.classified_output or ""):
+        print(f"⏩ Run {journal.run_id} already finished classification: {journal.classified_output}")
+        return journal.classified_output
+
     # Check if file has data
     try:
-        df = pd.read_csv(input_csv_path)
+        df = load_scraped_jobs(input_csv_path)
         if df.empty:
             print("⚠️ Scraped CSV is empty. Nothing to classify.")
             return
@@ -160,12 +514,14 @@ def run_classification_phase(input_csv_path):
 
     print(f"🧠 Loading model: {MODEL_NAME}")
     print(f"📄 Processing {len(df)} jobs from: {input_csv_path}")
+    if journal is not None and journal.predictions:
+        print(f"📓 {len(journal.predictions)} predictions already journaled for run {journal.run_id}")
+    if journal is not None and journal.failed_batches:
+        print(f"📓 Re-classifying {len(journal.failed_batches)} batches that failed while streaming")
 
     # Initialize Ollama Client
     try:
-        client = ollama.Client()
-        # Quick health check (optional)
-        # client.list()
+        client, cache = init_classifier()
     except Exception as e:
         print(f"❌ Could not connect to Ollama. Is it running? Error: {e}")
         return
@@ -173,24 +529,16 @@ def run_classification_phase(input_csv_path):
     # Run Inference
     print("🚀 Starting classification... (This may take time depending on your GPU)")
 
-    # Using progress bar if available, otherwise simple loop
-    from tqdm import tqdm
-    tqdm.pandas(desc="Classifying")
-
-    # Run the classification
     try:
-        # If tqdm is installed, this shows a nice progress bar
-        df["Predicted"] = df.progress_apply(lambda row: classify_job_row(client, row), axis=1)
-    except ImportError:
-        # Fallback if tqdm not installed
-        df["Predicted"] = df.apply(lambda row: classify_job_row(client, row), axis=1)
+        df = predict_jobs(df, client, cache, journal)
+    finally:
+        close_classifier(client, cache)
 
     print("\n🧹 Filtering for relevant jobs (Classified as '1')...")
 
     total_jobs = len(df)
 
-    # We use .astype(str) and .contains('1') to be robust against "1", "1 ", "1\n", etc.
-    df_filtered = df[df['Predicted'].astype(str).str.contains('1', na=False)].copy()
+    df_filtered = df[relevant_mask(df['Predicted'])].copy()
 
     kept_jobs = len(df_filtered)
     dropped_jobs = total_jobs - kept_jobs
@@ -202,12 +550,24 @@ def run_classification_phase(input_csv_path):
 
     df_filtered.to_csv(output_filename, index=False)
 
+    if USE_CASCADE:
+        # Full scored output (all rows) for auditing: python -m utils_llm.cascade <file> <baseline>
+        cascade_filename = f"{base}_CASCADE{ext}"
+        df.to_csv(cascade_filename, index=False)
+        print(f"🪜 Cascade audit file (all rows): {cascade_filename}")
+
+    if cumulative_csv:
+        merge_into_cumulative(df, cumulative_csv)
+
+    if journal is not None:
+        journal.classify_done(output_filename)
+
     print(f"\n✅ CLASSIFICATION COMPLETE")
     print(f"📉 Dropped {dropped_jobs} irrelevant jobs (labeled '0').")
     print(f"💾 Saved {kept_jobs} relevant jobs to: {output_filename}")
 
     # Print a quick preview of "Yes" (1) results
-    yes_jobs = df[df['Predicted'].astype(str).str.contains('1', na=False)]
+    yes_jobs = df[relevant_mask(df['Predicted'])]
     print(f"\n🔍 Found {len(yes_jobs)} potential matches:")
     if not yes_jobs.empty:
         print(yes_jobs[['Job Title', 'Company', 'Predicted']].head().to_string())
@@ -215,21 +575,247 @@ def run_classification_phase(input_csv_path):
     return output_filename
 
 
+def run_chunked_classification(input_paths, output_csv=None, chunksize=CLASSIFY_CHUNK_SIZE, journal=None):
+    """
+    Classifies any number of scraped/labeled CSVs in fixed-size chunks,
+    appending each chunk's relevant rows to one _CLASSIFIED output. Only the
+    job columns are read (existing Good/Predicted columns are ignored) and a
+    "Source File" column records where each row came from.
+
+    Returns:
+        str: Path of the classified CSV, or None if nothing was classified
+    """
+    print("\n" + "=" * 60)
+    print("CHUNKED CLASSIFICATION")
+    print("=" * 60)
+
+    input_paths = [p for p in input_paths if os.path.exists(p)]
+    if not input_paths:
+        print("❌ Error: No input CSVs found. Skipping classification.")
+        return None
+
+    if output_csv is None:
+        base, ext = os.path.splitext(get_unique_filename(prefix="backfill"))
+        output_csv = f"{base}_CLASSIFIED{ext}"
+    base, ext = os.path.splitext(output_csv)
+    cascade_csv = base.replace("_CLASSIFIED", "") + f"_CASCADE{ext}"
+
+    print(f"🧠 Loading model: {MODEL_NAME}")
+    print(f"📄 {len(input_paths)} input files, {chunksize} rows per chunk -> {output_csv}")
+
+    try:
+        client, cache = init_classifier()
+    except Exception as e:
+        print(f"❌ Could not connect to Ollama. Is it running? Error: {e}")
+        return None
+
+    total_jobs = kept_jobs = chunks = 0
+    header_written = set()
+
+    def append(df, path):
+        # The first chunk overwrites any previous output, later chunks append
+        df.to_csv(path, mode="a" if path in header_written else "w", header=path not in header_written, index=False)
+        header_written.add(path)
+
+    try:
+        for path in input_paths:
+            reader = pd.read_csv(path, chunksize=chunksize, usecols=lambda c: c in JOB_COLUMNS)
+            for chunk in reader:
+                chunk = chunk.reindex(columns=JOB_COLUMNS)
+                chunk["Source File"] = path
+
+                chunk = predict_jobs(chunk, client, cache, journal)
+                relevant = chunk[relevant_mask(chunk['Predicted'])]
+
+                append(relevant, output_csv)
+                if USE_CASCADE:
+                    append(chunk, cascade_csv)
+
+                chunks += 1
+                total_jobs += len(chunk)
+                kept_jobs += len(relevant)
+                print(f"   🧠 Chunk {chunks} ({os.path.basename(path)}): {len(chunk)} jobs, {len(relevant)} relevant")
+    finally:
+        close_classifier(client, cache)
+
+    if USE_CASCADE and cascade_csv in header_written:
+        print(f"🪜 Cascade audit file (all rows): {cascade_csv}")
+
+    print("\n✅ CHUNKED CLASSIFICATION COMPLETE")
+    print(f"📉 Dropped {total_jobs - kept_jobs} irrelevant jobs (labeled '0').")
+    print(f"💾 Saved {kept_jobs} relevant jobs to: {output_csv}")
+    return output_csv if output_csv in header_written else None
+
+
+# ==============================================================================
+# STREAMING MODE: SCRAPE AND CLASSIFY CONCURRENTLY
+# ==============================================================================
+
+def _classification_worker(batches, client, cache, classified_csv, totals, journal=None):
+    """
+    Drains scraped batches from the queue, classifies them and appends the results.
+    Classified batches are kept in totals["frames"] (merged into the cumulative CSV
+    once at the end); failed batches are listed in totals["failed"] and journaled.
+    """
+    base, ext = os.path.splitext(classified_csv)
+    cascade_csv = base.replace("_CLASSIFIED", "") + f"_CASCADE{ext}"
+
+    while True:
+        jobs = batches.get()
+        if jobs is None:  # Sentinel: scraping finished
+            break
+
+        # A failed batch must not stop the worker, or the scraper would block on a full queue
+        company = jobs[0].get("Company")
+        try:
+            with span("classify_batch", company=company):
+                df = predict_jobs(pd.DataFrame(jobs), client, cache, journal)
+            yes_jobs = df[relevant_mask(df['Predicted'])]
+
+            save_batch_to_csv(yes_jobs.to_dict("records"), classified_csv)
+            if USE_CASCADE:
+                save_batch_to_csv(df.to_dict("records"), cascade_csv)
+
+            totals["frames"].append(df)
+            totals["classified"] += len(df)
+            totals["kept"] += len(yes_jobs)
+            print(f"   🧠 Classified batch of {len(df)} jobs ({len(yes_jobs)} relevant)")
+        except Exception as e:
+            print(f"   ❌ Classification failed for a batch of {len(jobs)} jobs: {e}")
+            totals["failed"].append((company, len(jobs)))
+            if journal is not None:
+                journal.batch_failed(company, len(jobs), str(e))
+
+
+def run_streaming_pipeline(job_index=None, cumulative_csv=None, journal=None):
+    """
+    Producer/consumer pipeline: the scraper puts each company's jobs on a
+    bounded queue as soon as they are saved, and a classifier thread drains it
+    concurrently. The raw and _CLASSIFIED CSVs are both written incrementally.
+
+    Returns:
+        tuple: (raw_csv_path, classified_csv_path)
+    """
+    print("\n" + "=" * 60)
+    print("STREAMING MODE: SCRAPING AND CLASSIFYING CONCURRENTLY")
+    print("=" * 60)
+
+    try:
+        client, cache = init_classifier()
+    except Exception as e:
+        print(f"❌ Could not connect to Ollama. Is it running? Error: {e}")
+        return run_scraping_phase(job_index, journal=journal), None
+
+    batches = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    totals = {"classified": 0, "kept": 0, "frames": [], "failed": []}
+
+    raw_csv = get_unique_filename()
+    base, ext = os.path.splitext(raw_csv)
+    classified_csv = f"{base}_CLASSIFIED{ext}"
+
+    worker = threading.Thread(
+        target=_classification_worker,
+        args=(batches, client, cache, classified_csv, totals, journal),
+        daemon=True
+    )
+    worker.start()
+
+    try:
+        # Blocks when the classifier falls STREAM_QUEUE_SIZE batches behind
+        run_scraping_phase(job_index, on_batch=batches.put, csv_filename=raw_csv, journal=journal)
+    finally:
+        batches.put(None)
+        print("\n⏳ Waiting for the classifier to finish the remaining batches...")
+        worker.join()
+        close_classifier(client, cache)
+        # One merge for the whole run instead of rewriting the cumulative CSV per batch
+        if cumulative_csv and totals["frames"]:
+            merge_into_cumulative(pd.concat(totals["frames"], ignore_index=True), cumulative_csv)
+
+    print(f"\n✅ STREAMING COMPLETE. Classified {totals['classified']} jobs, kept {totals['kept']}.")
+    if totals["failed"]:
+        failed_jobs = sum(count for _, count in totals["failed"])
+        companies = ", ".join(str(company) for company, _ in totals["failed"])
+        print(f"⚠️  {len(totals['failed'])} batches ({failed_jobs} jobs) were not classified: {companies}")
+        if journal is not None:
+            print(f"   Classify them with: python indeed_pipeline_main.py --resume {journal.run_id}")
+    return raw_csv, (classified_csv if os.path.exists(classified_csv) else None)
+
+
+def finish_trace(trace_path):
+    """Closes the span trace and prints its per-stage / per-company summary."""
+    stop_trace()
+    if trace_path and os.path.exists(trace_path):
+        summarize_trace(trace_path)
+        print(f"⏱️  Trace: {trace_path} (python -m utils_pipeline.tracing {trace_path})")
+
+
 # ==============================================================================
 # MAIN ENTRY POINT
 # ==============================================================================
 
 if __name__ == "__main__":
-    # 1. Run the Scraper (Generates the RAW file)
-    raw_file_path = run_scraping_phase()
-
+    parser = argparse.ArgumentParser(description="Scrape Indeed postings and classify them with the local LLM.")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Continue an interrupted run from its journal in data/runs/")
+    parser.add_argument("--classify-only", nargs="+", metavar="CSV",
+                        help="Skip scraping and classify these CSVs (globs allowed) in bounded-memory chunks, "
+                             "e.g. 'data/jobs_*.csv' 'Local_LLM/*.csv'")
+    parser.add_argument("--output", help="Output CSV for --classify-only (default: data/backfill_<date>_CLASSIFIED.csv)")
+    args = parser.parse_args()
+
+    # Every run is journaled so it can be resumed after a crash
+    journal = RunJournal.resume(args.resume) if args.resume else RunJournal.new()
+    print(f"📓 Run {journal.run_id} (journal: {journal.path}; resume with --resume {journal.run_id})")
+
+    trace_path = None
+    if ENABLE_TRACING:
+        trace_path = start_trace(os.path.join(TRACE_DIR, f"{journal.run_id}.jsonl"))
+
+    if args.classify_only:
+        inputs = list(dict.fromkeys(path for pattern in args.classify_only for path in sorted(glob.glob(pattern))))
+        try:
+            with span("classify_only"):
+                run_chunked_classification(inputs, args.output, journal=journal)
+        finally:
+            journal.close()
+            finish_trace(trace_path)
+        raise SystemExit
+
+    job_index = JobIndex() if INCREMENTAL_MODE else None
+
+    cumulative_csv = CUMULATIVE_CSV if INCREMENTAL_MODE else None
     classified_file_path = None
 
-    # 2. Run the Classifier (Generates the CLASSIFIED file)
-    if raw_file_path and os.path.exists(raw_file_path):
-        classified_file_path = run_classification_phase(raw_file_path)
+    if STREAMING_MODE and args.resume:
+        # The scraped CSV is already partly written, so a resumed run finishes in
+        # two phases; journaled predictions from the streaming attempt are reused
+        print("ℹ️  Resuming a run in two-phase mode (STREAMING_MODE applies to new runs only)")
+
+    if STREAMING_MODE and not args.resume:
+        # 1+2. Scrape and classify concurrently (RAW and CLASSIFIED files grow together)
+        try:
+            with span("streaming_pipeline"):
+                raw_file_path, classified_file_path = run_streaming_pipeline(job_index, cumulative_csv, journal)
+        finally:
+            if job_index is not None:
+                job_index.close()
     else:
-        print("❌ Pipeline stopped after Phase 1 (No data generated).")
+        # 1. Run the Scraper (Generates the RAW file, new postings only in incremental mode)
+        try:
+            with span("scrape_phase"):
+                raw_file_path = run_scraping_phase(job_index, journal=journal)
+        finally:
+            if job_index is not None:
+                job_index.close()
+
+        # 2. Run the Classifier (Generates the CLASSIFIED file)
+        if raw_file_path and os.path.exists(raw_file_path):
+            with span("classify_phase"):
+                classified_file_path = run_classification_phase(raw_file_path, cumulative_csv=cumulative_csv,
+                                                                journal=journal)
+        else:
+            print("❌ Pipeline stopped after Phase 1 (No data generated).")
 
     # 3. Final Summary Report
     print("\n" + "=" * 60)
@@ -246,4 +832,11 @@ if __name__ == "__main__":
         print("\n2️⃣  AI CLASSIFIED DATA:")
         print("    -> (Skipped or Failed)")
 
-    print("=" * 60)
\ No newline at end of file
+    if INCREMENTAL_MODE:
+        print("\n3️⃣  CUMULATIVE DATA (All runs):")
+        print(f"    -> {CUMULATIVE_CSV}")
+
+    print(f"\n📓 Run journal: {journal.path}")
+    print("=" * 60)
+    journal.close()
+    finish_trace(trace_path)
\ No newline at end of file
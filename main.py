@@ -62,7 +62,7 @@ def main():
     # Create data directory if it doesn't exist
     os.makedirs("data", exist_ok=True)
 
-    driver = init_driver(headless=False)    # Change to true to make headless scrapping
+    driver = init_driver(headless=False, block_resources=True)    # Change to true to make headless scrapping
 
     # Log in to LinkedIn
     #login_to_linkedin(driver)
@@ -81,6 +81,7 @@ def main():
         print(f"Total jobs found so far: {len(all_jobs)}")
         time.sleep(3)  # Delay time between searches
 
+    driver.page_stats.print_summary()
     driver.quit()
 
     if all_jobs:
@@ -2,6 +2,8 @@ import pandas as pd
 import json
 import os
 
+from utils_llm.prompt_builder import build_prompt, require_tokenizer, TRAINING_QUESTION, DESCRIPTION_TOKEN_BUDGET
+
 # --- CONFIGURATION ---
 # Updated to look inside the 'data' folder
 INPUT_CSV = os.path.join("data", "Train_Data_Consolidated_Broader_demo.csv")
@@ -33,7 +35,11 @@ def prepare_data():
     df = df.dropna(subset=['Description', LABEL_COLUMN])
     print(f"   Dropped {initial_count - len(df)} rows with missing values.")
 
+    # Training prompts must be cut exactly like serving prompts: no character fallback here
+    require_tokenizer()
+
     alpaca_data = []
+    print(f"   Descriptions are compacted to {DESCRIPTION_TOKEN_BUDGET} tokens.")
 
     # The instruction matches your system prompt intent
     instruction_text = (
@@ -45,14 +51,9 @@ def prepare_data():
     )
 
     for index, row in df.iterrows():
-        # 1. Construct the Input (Truncated to 2000 chars for training efficiency)
-        input_text = (
-            f"Job Title: {row['Job Title']}\n"
-            f"Company: {row['Company']}\n"
-            f"Location: {row['Location']}\n"
-            f"Description: {str(row['Description'])[:2000]}\n"
-            f"Does this job fit my criteria?"
-        )
+        # 1. Construct the Input (boilerplate stripped and cut to the same token
+        #    budget the inference prompts use, so train and serve match)
+        input_text = build_prompt(row, question=TRAINING_QUESTION)
 
         # 2. Construct the Output
         try:
@@ -0,0 +1,110 @@
+"""
+Shared fixtures: a stub Ollama server for the classification tests.
+
+OllamaStub answers POST /api/generate and GET /api/tags on a local port. The
+answer and the delay of each generate call come from functions of the prompt,
+so tests can make later rows finish first, and the stub records how many
+requests were in flight at once.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class OllamaStub:
+    """
+    Args:
+        answer: prompt -> response text (default "1")
+        delay: prompt -> seconds to wait before answering (default 0)
+        port: Port to bind (0 picks a free one; pass an old port to restart a stopped stub)
+    """
+
+    def __init__(self, answer=None, delay=None, port=0):
+        self.answer = answer or (lambda prompt: "1")
+        self.delay = delay or (lambda prompt: 0.0)
+        self.status = 200          # Set to 500 to make every request fail with a server error
+        self.prompts = []          # Prompts of answered generate calls, in completion order
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Shuts the server down: later connections are refused."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if stub.status != 200:
+                    self._reply(stub.status, {"error": "stub is failing"})
+                else:
+                    self._reply(200, {"models": []})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                if stub.status != 200:
+                    self._reply(stub.status, {"error": "stub is failing"})
+                    return
+
+                prompt = body.get("prompt", "")
+                with stub._lock:
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay(prompt))
+                    response = stub.answer(prompt)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                        stub.prompts.append(prompt)
+
+                self._reply(200, {"model": body.get("model", "stub"), "created_at": "2025-01-01T00:00:00Z",
+                                  "response": response, "done": True})
+
+        return Handler
+
+
+@pytest.fixture
+def ollama_stub():
+    """Factory for OllamaStub servers; every stub is stopped after the test."""
+    stubs = []
+
+    def start(**kwargs):
+        stub = OllamaStub(**kwargs)
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        try:
+            stub.stop()
+        except Exception:
+            pass
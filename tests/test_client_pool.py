@@ -0,0 +1,76 @@
+import time
+
+import pandas as pd
+
+from utils_llm.client_pool import ClientPool
+from utils_llm.ollama_engine import classify_rows_concurrently, generate_label
+
+
+def classify_title(client, row):
+    return generate_label(client, "stub-model", row["Job Title"])
+
+
+def title_rows(count):
+    return [pd.Series({"Job Title": f"row-{i}"}) for i in range(count)]
+
+
+def test_requests_go_to_the_host_with_fewest_in_flight(ollama_stub):
+    slow = ollama_stub(delay=lambda p: 0.3)
+    fast = ollama_stub(delay=lambda p: 0.01)
+    pool = ClientPool([slow.url, fast.url], request_timeout=5)
+
+    predictions = classify_rows_concurrently(title_rows(20), classify_title, pool, max_concurrency=4)
+
+    assert predictions == ["1"] * 20
+    # Four workers over two idle hosts start two requests on each
+    assert slow.max_in_flight == 2
+    # The slow host stays busy, so the fast one takes most of the rows
+    assert len(fast.prompts) > len(slow.prompts) > 0
+
+
+def test_rows_fail_over_when_a_host_goes_down_partway(ollama_stub):
+    steady = ollama_stub(delay=lambda p: 0.02)
+    flaky = ollama_stub(delay=lambda p: 0.02)
+    pool = ClientPool([steady.url, flaky.url], request_timeout=5, retry_after=60)
+
+    def classify_and_break(client, row):
+        if row["Job Title"] == "row-10":
+            flaky.stop()
+        return classify_title(client, row)
+
+    predictions = classify_rows_concurrently(title_rows(30), classify_and_break, pool, max_concurrency=2)
+
+    assert predictions == ["1"] * 30
+    assert pool._failures[flaky.url] >= 1
+    assert len(steady.prompts) + len(flaky.prompts) == 30
+
+
+def test_server_errors_fail_over_to_the_other_host(ollama_stub):
+    healthy = ollama_stub()
+    broken = ollama_stub()
+    pool = ClientPool([broken.url, healthy.url], request_timeout=5, retry_after=60)
+    broken.status = 500
+
+    predictions = classify_rows_concurrently(title_rows(5), classify_title, pool, max_concurrency=1)
+
+    assert predictions == ["1"] * 5
+    assert pool._failures[broken.url] == 1  # Skipped for retry_after after the first 500
+    assert len(healthy.prompts) == 5
+
+
+def test_down_host_is_readmitted_after_retry_after(ollama_stub):
+    steady = ollama_stub()
+    flaky = ollama_stub()
+    pool = ClientPool([steady.url, flaky.url], request_timeout=5, retry_after=0.3)
+
+    port = flaky.port
+    flaky.stop()
+    assert classify_rows_concurrently(title_rows(4), classify_title, pool, max_concurrency=1) == ["1"] * 4
+    assert pool._failures[flaky.url] == 1
+
+    # Back on the same port: health-checked and served again once retry_after has passed
+    restarted = ollama_stub(port=port)
+    time.sleep(0.4)
+    assert classify_rows_concurrently(title_rows(4), classify_title, pool, max_concurrency=1) == ["1"] * 4
+    assert len(restarted.prompts) > 0
+    assert pool._failures[flaky.url] == 1
@@ -0,0 +1,50 @@
+import ollama
+import pytest
+import pandas as pd
+
+from utils_llm.ollama_engine import classify_dataframe, classify_rows_concurrently, generate_label, parse_label
+
+
+def classify_title(client, row):
+    return generate_label(client, "stub-model", row["Job Title"])
+
+
+def row_number(prompt):
+    return int(prompt.split("-")[1])
+
+
+def test_results_are_written_back_by_position_when_responses_arrive_out_of_order(ollama_stub):
+    rows = 12
+    # Later rows answer first; the label encodes the row, so a misplaced result is visible
+    stub = ollama_stub(answer=lambda p: str(row_number(p) % 2),
+                       delay=lambda p: 0.02 * (rows - row_number(p)))
+    df = pd.DataFrame({"Job Title": [f"row-{i}" for i in range(rows)]}, index=range(100, 100 + rows))
+
+    predictions = classify_dataframe(df, classify_title, ollama.Client(host=stub.url), max_concurrency=4)
+
+    completion_order = [row_number(p) for p in stub.prompts]
+    assert completion_order != sorted(completion_order)
+    assert list(predictions.index) == list(df.index)
+    assert list(predictions) == [str(i % 2) for i in range(rows)]
+
+
+def test_in_flight_requests_never_exceed_the_limit(ollama_stub):
+    stub = ollama_stub(delay=lambda p: 0.05)
+    rows = [pd.Series({"Job Title": f"row-{i}"}) for i in range(20)]
+
+    predictions = classify_rows_concurrently(rows, classify_title, ollama.Client(host=stub.url), max_concurrency=3)
+
+    assert predictions == ["1"] * 20
+    assert stub.max_in_flight == 3
+
+
+def test_label_survives_leading_whitespace_token(ollama_stub):
+    stub = ollama_stub(answer=lambda p: " \n1")
+
+    assert generate_label(ollama.Client(host=stub.url), "stub-model", "row-0") == "1"
+
+
+def test_label_parse_stays_strict():
+    for answer in ("2", "10", "yes", ""):
+        with pytest.raises(ValueError):
+            parse_label(answer)
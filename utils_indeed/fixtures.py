@@ -0,0 +1,134 @@
+"""
+Record/replay fixtures for the Indeed scraper.
+
+Recording: wrap a live driver in RecordingDriver. Every time the scraper reads
+`driver.page_source` (once per results page after scrolling, once per viewjob
+page) the HTML is saved to the fixture directory under a name derived from the
+path and query of the URL the scraper requested with driver.get() (not the
+final URL, which redirects and client-side rewrites can change).
+
+Replay: FixtureServer serves the saved pages from a local HTTP server. Point
+the scraper at it with search_jobs_for_company(..., base_url=server.base_url)
+or the INDEED_BASE_URL environment variable.
+"""
+
+import os
+import hashlib
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_FIXTURE_DIR = os.path.join("data", "fixtures", "indeed")
+
+
+def fixture_name_for_url(url):
+    """
+    Maps a URL (or a path+query) to a fixture filename. The host is ignored so
+    recorded indeed.com pages match requests made to the local server.
+
+    e.g. /viewjob?jk=abc123        -> viewjob_abc123.html
+         /jobs?q=TCW+director&l=US -> jobs_<hash of sorted query>.html
+    """
+    parsed = urllib.parse.urlparse(url)
+    query = urllib.parse.parse_qs(parsed.query)
+    page = parsed.path.strip("/").replace("/", "_") or "index"
+
+    if page == "viewjob" and query.get("jk"):
+        return f"viewjob_{query['jk'][0]}.html"
+
+    canonical_query = urllib.parse.urlencode(sorted(query.items()), doseq=True)
+    digest = hashlib.sha1(canonical_query.encode("utf-8")).hexdigest()[:12]
+    return f"{page}_{digest}.html"
+
+
+class RecordingDriver:
+    """
+    Thin proxy around a WebDriver that saves each page_source read to disk.
+    All other attributes are delegated to the wrapped driver.
+    """
+
+    def __init__(self, driver, fixture_dir=DEFAULT_FIXTURE_DIR):
+        self._driver = driver
+        self.fixture_dir = fixture_dir
+        self.recorded = set()
+        self._requested = {}  # window handle -> URL last requested in it
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    def get(self, url):
+        # Replay looks pages up by the requested URL, so that is what names the fixture
+        self._driver.get(url)
+        self._requested[self._driver.current_window_handle] = url
+
+    @property
+    def page_source(self):
+        html = self._driver.page_source
+        url = self._requested.get(self._driver.current_window_handle, self._driver.current_url)
+        name = fixture_name_for_url(url)
+
+        # Later reads of the same URL (e.g. after scrolling) overwrite earlier ones
+        with open(os.path.join(self.fixture_dir, name), "w", encoding="utf-8") as f:
+            f.write(html)
+        self.recorded.add(name)
+        return html
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    fixture_dir = DEFAULT_FIXTURE_DIR
+
+    def do_GET(self):
+        path = os.path.join(self.fixture_dir, fixture_name_for_url(self.path))
+
+        if not os.path.exists(path):
+            body = b"<html><body><h1>Page not found</h1></body></html>"
+            self.send_response(404)
+        else:
+            with open(path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scraper output readable
+
+
+class FixtureServer:
+    """
+    Local HTTP server that replays recorded Indeed pages.
+
+    Usage:
+        with FixtureServer("data/fixtures/indeed") as server:
+            search_jobs_for_company(driver, ..., base_url=server.base_url)
+    """
+
+    def __init__(self, fixture_dir=DEFAULT_FIXTURE_DIR, host="127.0.0.1", port=0):
+        handler = type("FixtureHandler", (_FixtureHandler,), {"fixture_dir": fixture_dir})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"🧪 Fixture server running at {self.base_url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
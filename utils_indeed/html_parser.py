@@ -0,0 +1,207 @@
+"""
+Offline parser for Indeed search-result and job-detail pages.
+
+The scraper grabs `driver.page_source` once per page and parses it here with
+lxml instead of issuing one WebDriver round-trip per field per card. The same
+functions work on saved HTML files, so parsing can be tested and benchmarked
+without a browser:
+
+    python -m utils_indeed.html_parser saved_search_page.html
+    python -m utils_indeed.html_parser saved_viewjob_page.html --job-page
+"""
+
+import re
+import argparse
+import urllib.parse
+
+import lxml.html
+
+# Selector lists are shared with the live scraper so both stay in sync
+JOB_CARD_SELECTORS = [
+    "div.job_seen_beacon",
+    ".jobsearch-ResultsList > li",
+    "[data-jk]",
+    ".slider_item"
+]
+
+TITLE_SELECTORS = [
+    "h2.jobTitle span[title]",
+    ".jobTitle a span",
+    "h2.jobTitle",
+    "[data-jk] h2"
+]
+
+COMPANY_SELECTORS = [
+    "[data-testid='company-name']",
+    ".companyName",
+    "span.companyName",
+    "[class*='companyName']"
+]
+
+LOCATION_SELECTORS = [
+    "[data-testid='text-location']",
+    ".companyLocation",
+    "div.companyLocation",
+    "[class*='companyLocation']"
+]
+
+JOB_LINK_SELECTOR = "h2.jobTitle a, a[data-jk]"
+CARD_DATE_SELECTOR = ".date, [class*='date']"
+
+DESCRIPTION_SELECTORS = [
+    "#jobDescriptionText",
+    ".jobsearch-jobDescriptionText",
+    "[id*='jobDescriptionText']",
+    ".job-description",
+    "[class*='jobDescriptionText']"
+]
+
+DATE_SELECTORS = [
+    ".jobsearch-JobMetadataFooter",
+    "[class*='metadata'] span",
+    ".jobsearch-JobMetadataHeader-item",
+    "[data-testid='jobsearch-JobMetadataHeader-item']"
+]
+
+DATE_WORDS = ['ago', 'today', 'yesterday', 'hour', 'day', 'month', 'posted']
+
+DEFAULT_BASE_URL = "https://www.indeed.com"
+
+# Elements that start a new line in rendered text (approximates WebElement.text)
+_BLOCK_TAGS = {"p", "div", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "section"}
+_HIDDEN_TAGS = {"script", "style", "noscript", "template"}
+
+
+def element_text(elem):
+    """
+    Returns the visible text of an lxml element with block elements on their
+    own lines and runs of whitespace collapsed, similar to Selenium's `.text`.
+    """
+    parts = []
+
+    def walk(node, is_root=False):
+        # The root element's tail text belongs to its parent, so it is skipped
+        tail = None if is_root else node.tail
+        if node.tag in _HIDDEN_TAGS:
+            if tail:
+                parts.append(tail)
+            return
+        is_block = isinstance(node.tag, str) and node.tag in _BLOCK_TAGS
+        if is_block:
+            parts.append("\n")
+        if node.text and isinstance(node.tag, str):
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+        if is_block:
+            parts.append("\n")
+        if tail:
+            parts.append(tail)
+
+    walk(elem, is_root=True)
+
+    lines = (re.sub(r"[ \t\r\f\v\xa0]+", " ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _first_text(node, selectors):
+    """Returns the text of the first selector that yields a non-empty match."""
+    for selector in selectors:
+        for elem in node.cssselect(selector):
+            text = element_text(elem)
+            if text:
+                return text
+    return ""
+
+
+def _job_url(card, base_url):
+    """Builds the viewjob URL from the card's `data-jk`, falling back to the title link."""
+    job_id = card.get("data-jk")
+    if job_id:
+        return f"{base_url}/viewjob?jk={job_id}"
+
+    links = card.cssselect(JOB_LINK_SELECTOR)
+    if links:
+        link_id = links[0].get("data-jk")
+        if link_id:
+            return f"{base_url}/viewjob?jk={link_id}"
+        href = links[0].get("href")
+        if href:
+            return urllib.parse.urljoin(base_url + "/", href)
+
+    return "N/A"
+
+
+def parse_job_cards(html, base_url=DEFAULT_BASE_URL):
+    """
+    Parses every job card on an Indeed search-results page.
+
+    Args:
+        html: Page source of the results page
+        base_url: Site root used to build absolute job URLs
+
+    Returns:
+        List of dicts with keys: title, company, location, job_url, card_date.
+        Missing fields are "" (title) or "N/A" like the live scraper.
+    """
+    tree = lxml.html.fromstring(html)
+
+    cards = []
+    for selector in JOB_CARD_SELECTORS:
+        cards = tree.cssselect(selector)
+        if cards:
+            break
+
+    parsed = []
+    for card in cards:
+        date_elems = card.cssselect(CARD_DATE_SELECTOR)
+        parsed.append({
+            "title": _first_text(card, TITLE_SELECTORS),
+            "company": _first_text(card, COMPANY_SELECTORS) or "N/A",
+            "location": _first_text(card, LOCATION_SELECTORS) or "N/A",
+            "job_url": _job_url(card, base_url),
+            "card_date": (element_text(date_elems[0]) if date_elems else "") or "N/A",
+        })
+
+    return parsed
+
+
+def parse_job_page(html):
+    """
+    Parses an Indeed viewjob page.
+
+    Returns:
+        tuple: (description_text, posted_date)
+    """
+    tree = lxml.html.fromstring(html)
+    description_text = _first_text(tree, DESCRIPTION_SELECTORS)
+
+    posted_date = "N/A"
+    for date_sel in DATE_SELECTORS:
+        for elem in tree.cssselect(date_sel):
+            date_text = element_text(elem)
+            if any(word in date_text.lower() for word in DATE_WORDS):
+                posted_date = date_text
+                break
+        if posted_date != "N/A":
+            break
+
+    return description_text, posted_date
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse a saved Indeed HTML page.")
+    parser.add_argument("html_file", help="Path to a saved search-results or viewjob page")
+    parser.add_argument("--job-page", action="store_true", help="Parse as a viewjob (detail) page")
+    args = parser.parse_args()
+
+    with open(args.html_file, "r", encoding="utf-8") as f:
+        page = f.read()
+
+    if args.job_page:
+        description, posted = parse_job_page(page)
+        print(f"Posted: {posted}")
+        print(description)
+    else:
+        for job in parse_job_cards(page):
+            print(f"{job['title']} | {job['company']} | {job['location']} | {job['job_url']}")
@@ -11,6 +11,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from utils_pipeline.tracing import traced
+from utils_pipeline.browser_resources import (PageLoadStats, DEFAULT_ALLOWLIST, content_settings_prefs,
+                                              enable_resource_blocking)
+
 try:
     import undetected_chromedriver as uc
     UNDETECTED_AVAILABLE = True
@@ -23,10 +27,17 @@ except ImportError:
     UNDETECTED_AVAILABLE = False
 
 
-def init_driver(headless=False):
+def init_driver(headless=False, block_resources=False, allowlist=DEFAULT_ALLOWLIST):
     """
     Initialize Chrome WebDriver using undetected-chromedriver to bypass Cloudflare.
     Uses a persistent user profile to save login state and cookies.
+
+    Args:
+        headless: Run Chrome without a window
+        block_resources: Skip images and tracking scripts (the scraper only reads text)
+        allowlist: Hosts that are never blocked (bot challenges must load in full)
+
+    The driver gets a PageLoadStats as driver.page_stats (bytes transferred and load time per page).
     """
 
     # --- PERSISTENT PROFILE SETUP ---
@@ -54,6 +65,9 @@ def init_driver(headless=False):
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--no-sandbox")
 
+        # Images on/off (with allowlist exceptions) is a content setting of the profile
+        options.add_experimental_option("prefs", content_settings_prefs(block_resources, allowlist))
+
         # Create driver with undetected-chromedriver
         driver = uc.Chrome(
             options=options,
@@ -65,6 +79,10 @@ def init_driver(headless=False):
         # Set a reasonable page load timeout
         driver.set_page_load_timeout(30)
 
+        driver.page_stats = PageLoadStats()
+        if block_resources:
+            enable_resource_blocking(driver, allowlist)
+
         print("✓ Driver initialized successfully")
         return driver
 
@@ -88,22 +106,30 @@ def init_driver(headless=False):
 
         options.add_argument(
             "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        options.add_experimental_option("prefs", content_settings_prefs(block_resources, allowlist))
 
         driver = webdriver.Chrome(options=options)
 
         # Anti-detection
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
+        driver.page_stats = PageLoadStats()
+        if block_resources:
+            enable_resource_blocking(driver, allowlist)
+
         return driver
 
 
-def wait_for_page_load(driver, timeout=20):
+@traced()
+def wait_for_page_load(driver, timeout=20, poll_frequency=0.5):
     """
     Wait for Indeed page to fully load, handling Cloudflare if present.
+    Returns as soon as a results element is present (no fixed buffer).
 
     Args:
         driver: Selenium/UC WebDriver instance
         timeout: Maximum time to wait (seconds)
+        poll_frequency: Seconds between readiness checks
 
     Returns:
         bool: True if page loaded successfully, False otherwise
@@ -111,6 +137,7 @@ def wait_for_page_load(driver, timeout=20):
     print("⏳ Waiting for page to load...")
 
     start_time = time.time()
+    challenge_reported = False
 
     # Success indicators (Indeed job search page elements)
     success_selectors = [
@@ -122,10 +149,14 @@ def wait_for_page_load(driver, timeout=20):
     ]
 
     while time.time() - start_time < timeout:
+        page_source = driver.page_source
+
         # Check if Cloudflare challenge is present
-        if "Additional Verification Required" in driver.page_source:
-            print("⚠️  Cloudflare challenge detected - waiting for automatic bypass...")
-            time.sleep(3)
+        if "Additional Verification Required" in page_source:
+            if not challenge_reported:
+                print("⚠️  Cloudflare challenge detected - waiting for automatic bypass...")
+                challenge_reported = True
+            time.sleep(poll_frequency)
             continue
 
         # Check for successful page load
@@ -134,17 +165,16 @@ def wait_for_page_load(driver, timeout=20):
                 elements = driver.find_elements(By.CSS_SELECTOR, selector)
                 if elements and len(elements) > 0:
                     print(f"✓ Page loaded successfully (found: {selector})")
-                    time.sleep(2)  # Extra time for dynamic content
                     return True
             except:
                 continue
 
         # Check if we're on an error page
-        if "Page not found" in driver.page_source or "No results" in driver.page_source:
+        if "Page not found" in page_source or "No results" in page_source:
             print("⚠️  No results found or error page detected")
             return False
 
-        time.sleep(1)
+        time.sleep(poll_frequency)
 
     print(f"⚠️  Page load timeout after {timeout} seconds")
 
@@ -0,0 +1,97 @@
+"""
+Persistent index of Indeed postings that have already been scraped.
+
+Jobs are keyed by Indeed's `jk` job key (the `data-jk` attribute on result
+cards, also present as `?jk=` in every viewjob URL). The scraper consults the
+index to skip opening detail pages for postings stored by a previous run.
+"""
+
+import os
+import sqlite3
+import datetime
+import urllib.parse
+
+DEFAULT_INDEX_PATH = os.path.join("data", "indeed_job_index.sqlite3")
+
+
+def extract_job_key(job_url):
+    """
+    Returns the Indeed `jk` job key from a job URL, or None if it has none.
+    e.g. https://www.indeed.com/viewjob?jk=abc123 -> "abc123"
+    """
+    if not job_url or job_url == "N/A":
+        return None
+
+    query = urllib.parse.urlparse(str(job_url)).query
+    values = urllib.parse.parse_qs(query).get("jk")
+    return values[0] if values else None
+
+
+class JobIndex:
+    """
+    SQLite-backed set of scraped Indeed job keys.
+
+    Supports `jk in index`, so it can be passed straight to
+    search_jobs_for_company(known_job_ids=...).
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                jk TEXT PRIMARY KEY,
+                company TEXT,
+                title TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+        # Keys are loaded once so membership checks during a scrape cost nothing
+        self._keys = {row[0] for row in self._conn.execute("SELECT jk FROM jobs")}
+
+    def __contains__(self, job_key):
+        return job_key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add_jobs(self, jobs):
+        """
+        Records a batch of scraped job dicts (as returned by search_jobs_for_company).
+        Jobs without a usable `jk` in their URL are ignored, and so are jobs
+        saved without a description (description limit hit or extraction
+        failed): they stay unindexed so a later run fetches them again.
+        """
+        today = datetime.date.today().isoformat()
+        added = 0
+
+        for job in jobs:
+            job_key = extract_job_key(job.get("Job URL"))
+            if not job_key or not str(job.get("Description") or "").strip():
+                continue
+
+            self._conn.execute(
+                """
+                INSERT INTO jobs (jk, company, title, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(jk) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                (job_key, job.get("Company"), job.get("Job Title"), today, today)
+            )
+            if job_key not in self._keys:
+                self._keys.add(job_key)
+                added += 1
+
+        self._conn.commit()
+        return added
+
+    def close(self):
+        self._conn.close()
@@ -1,173 +1,147 @@
-import time
-import random  # Added for human-like delays
+import os
 import urllib.parse
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from utils_indeed.indeed_driver import wait_for_page_load
-
-
-def extract_job_description(driver, job_url):
+from utils_indeed.wait_policy import DEFAULT_WAIT_POLICY
+from utils_indeed.job_index import extract_job_key
+from utils_pipeline.title_rules import TitleRules
+from utils_pipeline.tracing import span, traced
+from utils_pipeline.browser_resources import record_page_load
+from utils_pipeline.detail_tab import detail_tab
+from utils_pipeline.scroll_stop import MarginalMatchStop, DEFAULT_MIN_MATCH_RATE
+from utils_indeed.html_parser import (parse_job_cards, parse_job_page, DESCRIPTION_SELECTORS,
+                                      JOB_CARD_SELECTORS, TITLE_SELECTORS, DEFAULT_BASE_URL)
+
+# Site root for search and viewjob URLs. Override (or pass base_url) to point
+# the scraper at a local fixture server, e.g. INDEED_BASE_URL=http://127.0.0.1:8000
+INDEED_BASE_URL = os.getenv("INDEED_BASE_URL", DEFAULT_BASE_URL)
+
+
+@traced()
+def extract_job_description(driver, job_url, wait_policy=DEFAULT_WAIT_POLICY):
     """
-    Opens a job posting in a new tab and extracts the job description and posting date.
+    Loads a job posting in the driver's persistent detail tab and extracts the job description and posting date.
     Returns tuple: (description_text, posted_date)
     """
     description_text = ""
     posted_date = "N/A"
 
-    # Store the original window handle (the job list) to ensure we can return
-    original_window = driver.current_window_handle
+    # One reused tab for all postings (no tab open/close per job)
+    tab = detail_tab(driver)
 
     try:
-        # Open a new tab safely using Selenium's native method
-        driver.switch_to.new_window('tab')
-        driver.get(job_url)
-
-        # RANDOMIZED DELAY: Wait 3 to 6 seconds (like a human reading the page load)
-        time.sleep(random.uniform(3, 6))
-
-        # Indeed job description selectors
-        description_selectors = [
-            "#jobDescriptionText",
-            ".jobsearch-jobDescriptionText",
-            "[id*='jobDescriptionText']",
-            ".job-description",
-            "[class*='jobDescriptionText']"
-        ]
-
-        description_elem = None
-        for selector in description_selectors:
-            try:
-                description_elem = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                )
-                if description_elem:
-                    print(f"   ✓ Found description using selector: {selector}")
-                    break
-            except TimeoutException:
-                continue
+        wait_policy.before_request()  # Polite rate limit between page loads
+        with span("driver.get", page="viewjob") as attrs:
+            tab.navigate(job_url)
+            attrs.update(record_page_load(driver, "viewjob"))
 
-        if description_elem:
-            description_text = description_elem.text.strip()
-            if description_text:
-                print(f"   ✓ Extracted description ({len(description_text)} characters)")
-                # RANDOMIZED DELAY: Wait 1 to 3 seconds (simulating reading/scanning)
-                time.sleep(random.uniform(1, 3))
-            else:
-                try:
-                    description_text = driver.execute_script("return arguments[0].innerText;", description_elem)
-                except:
-                    pass
-
-        # Extract posting date from Indeed
-        date_selectors = [
-            ".jobsearch-JobMetadataFooter",
-            "[class*='metadata'] span",
-            ".jobsearch-JobMetadataHeader-item",
-            "[data-testid='jobsearch-JobMetadataHeader-item']"
-        ]
-
-        for date_sel in date_selectors:
-            try:
-                date_elems = driver.find_elements(By.CSS_SELECTOR, date_sel)
-                for elem in date_elems:
-                    date_text = elem.text.strip()
-                    if any(word in date_text.lower() for word in
-                           ['ago', 'today', 'yesterday', 'hour', 'day', 'month', 'posted']):
-                        posted_date = date_text
-                        print(f"   ✓ Found posting date: {posted_date}")
-                        break
-                if posted_date != "N/A":
-                    break
-            except:
-                continue
+        # Wait until any known description container is present, then parse
+        # the page source once instead of querying each selector over WebDriver
+        if not wait_policy.wait_for_element(driver, ", ".join(DESCRIPTION_SELECTORS)):
+            print("   ⚠️ No description element found with any selector")
+
+        with span("parse_job_page"):
+            description_text, posted_date = parse_job_page(driver.page_source)
+
+        if description_text:
+            print(f"   ✓ Extracted description ({len(description_text)} characters)")
+
+        if posted_date != "N/A":
+            print(f"   ✓ Found posting date: {posted_date}")
 
     except Exception as e:
         print(f"   ✗ Error extracting job description: {e}")
 
     finally:
-        # ROBUST TAB CLEANUP
-        try:
-            # If we are on a different tab than the original, close it
-            if driver.current_window_handle != original_window:
-                driver.close()
-
-            # Switch back to the original window
-            driver.switch_to.window(original_window)
-            time.sleep(0.5)
-
-        except Exception as e:
-            print(f"   ⚠️ Critical error returning to main list: {e}")
-            # Emergency fallback: try to switch to the first handle available
-            if len(driver.window_handles) > 0:
-                driver.switch_to.window(driver.window_handles[0])
+        # Always back to the results list, whatever happened in the detail tab
+        tab.return_home()
 
     return description_text, posted_date
 
 
-def scroll_and_load_jobs(driver, target_jobs=15, max_scroll_attempts=10):
+@traced()
+def scroll_and_load_jobs(driver, target_jobs=15, max_scroll_attempts=10, wait_policy=DEFAULT_WAIT_POLICY,
+                         title_rules=None, min_match_rate=DEFAULT_MIN_MATCH_RATE):
     """
     Scroll through Indeed's job listings to load more results.
     Indeed uses infinite scroll for job loading.
+
+    With title_rules, newly loaded cards are checked against the title filter
+    after every scroll, and scrolling stops once fewer than min_match_rate of
+    the recent cards match (see utils_pipeline/scroll_stop.py).
+
+    Returns:
+        tuple: (jobs loaded, reason scrolling stopped)
     """
     print(f"\n🔄 Starting scroll to load {target_jobs} jobs...")
 
+    card_selector = ", ".join(JOB_CARD_SELECTORS)
+    match_stop = (MarginalMatchStop(title_rules, JOB_CARD_SELECTORS, TITLE_SELECTORS, min_match_rate)
+                  if title_rules is not None else None)
+    if match_stop is not None and not match_stop.enabled:
+        match_stop = None  # Match-all rules only: nothing to measure the rate with
+
     def count_visible_jobs():
         """Count currently visible job cards"""
         try:
-            job_cards = driver.find_elements(By.CSS_SELECTOR,
-                                             "div.job_seen_beacon, .jobsearch-ResultsList > li, [data-jk], .slider_item")
-            return len(job_cards)
+            return len(driver.find_elements(By.CSS_SELECTOR, card_selector))
         except:
             return 0
 
     # Wait for initial load
-    try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.job_seen_beacon, [data-jk]"))
-        )
-        time.sleep(2)
-    except TimeoutException:
+    if not wait_policy.wait_for_element(driver, "div.job_seen_beacon, [data-jk]",
+                                        timeout=wait_policy.page_load_timeout):
         print("   ⚠️ Initial job load timeout")
 
     previous_count = count_visible_jobs()
     print(f"   Initial jobs loaded: {previous_count}")
 
     stagnant_count = 0
+    stop_reason = f"max scroll attempts ({max_scroll_attempts}) reached"
+
+    if match_stop is not None:
+        match_stop.update(driver)
+        if match_stop.stop_reason():
+            stop_reason = match_stop.stop_reason()
+            print(f"   🛑 Not scrolling: {stop_reason}")
+            return previous_count, stop_reason
 
     for attempt in range(max_scroll_attempts):
-        # Scroll down
+        # Scroll the window and the job list container (if present) in one call
         try:
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-
-            # RANDOMIZED DELAY: 2 to 4 seconds between scrolls
-            time.sleep(random.uniform(2, 4))
-
-            # Also scroll the job list container if it exists
-            try:
-                job_list = driver.find_element(By.CSS_SELECTOR, ".jobsearch-ResultsList, #mosaic-provider-jobcards")
-                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", job_list)
-            except:
-                pass
+            driver.execute_script("""
+                window.scrollTo(0, document.body.scrollHeight);
+                const jobList = document.querySelector('.jobsearch-ResultsList, #mosaic-provider-jobcards');
+                if (jobList) { jobList.scrollTop = jobList.scrollHeight; }
+            """)
         except:
+            stop_reason = "scroll script failed"
             break
 
-        time.sleep(1)  # Small buffer
-
-        current_count = count_visible_jobs()
+        # Returns as soon as new cards appear (or after scroll_timeout if none do)
+        current_count = wait_policy.wait_for_more_elements(driver, card_selector, previous_count)
         new_jobs = current_count - previous_count
 
-        print(f"   Scroll #{attempt + 1}: {current_count} jobs visible (+{new_jobs} new)")
+        matches = ""
+        if match_stop is not None:
+            new_titled, new_matches = match_stop.update(driver)
+            matches = f", {new_matches}/{new_titled} new titles match"
+        print(f"   Scroll #{attempt + 1}: {current_count} jobs visible (+{new_jobs} new{matches})")
 
         if current_count >= target_jobs:
             print(f"\n✅ Target reached! {current_count} jobs loaded")
-            return current_count
+            return current_count, "target reached"
+
+        if match_stop is not None and match_stop.stop_reason():
+            stop_reason = match_stop.stop_reason()
+            print(f"   🛑 Stopping scroll: {stop_reason}")
+            break
 
         if current_count == previous_count:
             stagnant_count += 1
             if stagnant_count >= 3:
                 print(f"   ⚠️ No new jobs loaded after {stagnant_count} attempts, stopping")
+                stop_reason = f"no new jobs after {stagnant_count} attempts"
                 break
         else:
             stagnant_count = 0
@@ -175,15 +149,31 @@ def scroll_and_load_jobs(driver, target_jobs=15, max_scroll_attempts=10):
         previous_count = current_count
 
     final_count = count_visible_jobs()
-    print(f"\n📊 Scroll complete: {final_count} jobs loaded (target was {target_jobs})")
-    return final_count
+    print(f"\n📊 Scroll complete: {final_count} jobs loaded (target was {target_jobs}; {stop_reason})")
+    return final_count, stop_reason
 
 
 def search_jobs_for_company(driver, company, titles, keywords, exclude_keywords,
-                            max_results=15, max_descriptions=10, location="United States"):
+                            max_results=15, max_descriptions=10, location="United States",
+                            known_job_ids=None, base_url=None, wait_policy=DEFAULT_WAIT_POLICY, triage=None):
     """
     Search for jobs at a specific company on Indeed and filter by titles.
+
+    known_job_ids: optional collection of Indeed job keys (`jk`) scraped in
+    previous runs (e.g. a JobIndex). Matching cards are skipped before their
+    detail page is opened.
+
+    base_url: site root to search (defaults to INDEED_BASE_URL).
+
+    wait_policy: WaitPolicy controlling readiness waits and the polite
+    interval between page loads.
+
+    triage: optional Triage that scores title/company/location before the
+    detail page is opened. Cards below its threshold are dropped and logged
+    to its audit CSV with the reason.
     """
+    base_url = (base_url or INDEED_BASE_URL).rstrip("/")
+
     # Build Indeed search query
     search_terms = f'{company} {" ".join(keywords)}'
 
@@ -191,49 +181,51 @@ def search_jobs_for_company(driver, company, titles, keywords, exclude_keywords,
     encoded_query = urllib.parse.quote(search_terms)
     encoded_location = urllib.parse.quote(location)
 
-    search_url = f"https://www.indeed.com/jobs?q={encoded_query}&l={encoded_location}"
+    search_url = f"{base_url}/jobs?q={encoded_query}&l={encoded_location}"
 
     print(f"Searching: {search_url}")
     print(f"Location: {location}")
     print(f"Company: {company}")
 
-    driver.get(search_url)
+    page_stats = getattr(driver, "page_stats", None)
+    page_mark = page_stats.mark() if page_stats is not None else 0
+
+    wait_policy.before_request()  # Polite rate limit between page loads
+    with span("driver.get", page="search") as attrs:
+        driver.get(search_url)
+        attrs.update(record_page_load(driver, "search"))
 
     # Wait for page to load and handle Cloudflare automatically
-    if not wait_for_page_load(driver, timeout=30):
+    if not wait_for_page_load(driver, timeout=wait_policy.page_load_timeout,
+                              poll_frequency=wait_policy.poll_frequency):
         print("❌ Page failed to load properly. Skipping this company.")
         return []
 
-    time.sleep(random.uniform(2, 4))  # Randomized initial buffer
+    # Include/exclude phrases compiled once for all cards of this search
+    title_rules = TitleRules(titles, exclude_keywords)
 
-    # Scroll to load more jobs
-    scroll_and_load_jobs(driver, target_jobs=max_results, max_scroll_attempts=10)
+    # Scroll to load more jobs (stops early once new cards stop matching the title filter)
+    _, scroll_stop_reason = scroll_and_load_jobs(driver, target_jobs=max_results, max_scroll_attempts=10,
+                                                 wait_policy=wait_policy, title_rules=title_rules)
 
-    # Get all job cards
-    job_card_selectors = [
-        "div.job_seen_beacon",
-        ".jobsearch-ResultsList > li",
-        "[data-jk]",
-        ".slider_item"
-    ]
-
-    job_cards = []
-    for selector in job_card_selectors:
-        job_cards = driver.find_elements(By.CSS_SELECTOR, selector)
-        if job_cards:
-            print(f"Found {len(job_cards)} job cards using selector: {selector}")
-            break
+    # Parse all job cards from a single page-source snapshot (one WebDriver call)
+    with span("parse_job_cards"):
+        job_cards = parse_job_cards(driver.page_source, base_url=base_url)
 
     if not job_cards:
         print("✗ No job cards found.")
         return []
 
+    print(f"Found {len(job_cards)} job cards")
+
     # Limit to max_results
     job_cards = job_cards[:max_results]
     print(f"Processing {len(job_cards)} job cards (limited to max_results={max_results})\n")
 
     results = []
     descriptions_extracted = 0
+    skipped_known = 0
+    skipped_triage = 0
 
     for i, card in enumerate(job_cards):
         try:
@@ -242,104 +234,43 @@ def search_jobs_for_company(driver, company, titles, keywords, exclude_keywords,
                 print("💥 CRITICAL: Browser session lost. Stopping search.")
                 break
 
-            # Extract job title
-            title_text = ""
-            title_selectors = [
-                "h2.jobTitle span[title]",
-                ".jobTitle a span",
-                "h2.jobTitle",
-                "[data-jk] h2"
-            ]
-
-            for title_sel in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, title_sel)
-                    title_text = title_elem.text.strip()
-                    if title_text:
-                        break
-                except:
-                    continue
-
+            title_text = card["title"]
             if not title_text:
                 continue
 
-            # Check exclusion keywords first
-            title_lower = title_text.lower()
-            if any(exclude_word.lower() in title_lower for exclude_word in exclude_keywords):
-                print(f"   ✗ Excluded by keyword: '{title_text}'")
+            # Exclusion keywords first, then title matching (one compiled regex each)
+            verdict = title_rules.evaluate(title_text)
+            if verdict.kind == "exclude":
+                print(f"   ✗ Excluded by keyword '{verdict.rule}': '{title_text}'")
                 continue
-
-            # Title matching logic
-            title_match = False
-            if "" in titles or any(not t.strip() for t in titles):
-                title_match = True
+            if verdict.kind == "match-all":
                 print(f"   ✓ Match all mode enabled - accepting: '{title_text}'")
+            elif verdict.accepted:
+                print(f"   ✓ Title match found: '{verdict.rule}' in '{title_text}'")
             else:
-                for target_title in titles:
-                    target_title_clean = target_title.strip().lower()
-                    if target_title_clean and target_title_clean in title_lower:
-                        title_match = True
-                        print(f"   ✓ Title match found: '{target_title}' in '{title_text}'")
-                        break
-
-            if not title_match:
                 print(f"   ✗ No title match for: '{title_text}'")
                 continue
 
-            # Extract company name
-            company_text = "N/A"
-            company_selectors = [
-                "[data-testid='company-name']",
-                ".companyName",
-                "span.companyName",
-                "[class*='companyName']"
-            ]
-
-            for company_sel in company_selectors:
-                try:
-                    company_elem = card.find_element(By.CSS_SELECTOR, company_sel)
-                    company_text = company_elem.text.strip()
-                    if company_text:
-                        print(f"   ✓ Found company: {company_text}")
-                        break
-                except:
-                    continue
-
+            company_text = card["company"]
             if company_text == "N/A":
                 company_text = company
 
-            # Extract location
-            location_text = "N/A"
-            location_selectors = [
-                "[data-testid='text-location']",
-                ".companyLocation",
-                "div.companyLocation",
-                "[class*='companyLocation']"
-            ]
-
-            for loc_sel in location_selectors:
-                try:
-                    loc_elem = card.find_element(By.CSS_SELECTOR, loc_sel)
-                    location_text = loc_elem.text.strip()
-                    if location_text:
-                        print(f"   ✓ Found location: {location_text}")
-                        break
-                except:
-                    continue
+            location_text = card["location"]
+            job_url = card["job_url"]
 
-            # Extract job URL
-            job_url = "N/A"
-            try:
-                # Get the job ID from data-jk attribute
-                job_id = card.get_attribute("data-jk")
-                if job_id:
-                    job_url = f"https://www.indeed.com/viewjob?jk={job_id}"
-                else:
-                    # Try to find the link
-                    link_elem = card.find_element(By.CSS_SELECTOR, "h2.jobTitle a, a[data-jk]")
-                    job_url = link_elem.get_attribute("href")
-            except:
-                pass
+            # Incremental mode: postings stored by a previous run are not re-opened
+            if known_job_ids is not None and extract_job_key(job_url) in known_job_ids:
+                print(f"   ⏭️ Already indexed, skipping: '{title_text}'")
+                skipped_known += 1
+                continue
+
+            # Hopeless postings are not worth a detail-page visit
+            if triage is not None:
+                fetch, score = triage.should_fetch(title_text, company_text, location_text, job_url, company)
+                if not fetch:
+                    print(f"   ⏭️ Triage score {score:.2f}, skipping: '{title_text}'")
+                    skipped_triage += 1
+                    continue
 
             # Extract Job Description and Date
             description_text = ""
@@ -349,22 +280,16 @@ def search_jobs_for_company(driver, company, titles, keywords, exclude_keywords,
             if should_extract_description and job_url and job_url != "N/A":
                 print(f"   📄 Job #{len(results) + 1}: {title_text}")
                 print(f"   🔗 Opening: {job_url}")
-                description_text, posted_text = extract_job_description(driver, job_url)
+                # The wait policy spaces out detail-page loads (no fixed sleep between jobs)
+                description_text, posted_text = extract_job_description(driver, job_url, wait_policy)
                 descriptions_extracted += 1
 
-                # RANDOMIZED DELAY: Wait 2-5 seconds between jobs (like a human deciding to click the next one)
-                time.sleep(random.uniform(2, 5))
-
             elif not should_extract_description:
                 print(f"   ⏭️ Skipping description extraction (limit reached: {max_descriptions})")
 
-            # Try to get posted date from card if not extracted from detail page
+            # Fall back to the posted date shown on the card
             if posted_text == "N/A":
-                try:
-                    date_elem = card.find_element(By.CSS_SELECTOR, ".date, [class*='date']")
-                    posted_text = date_elem.text.strip()
-                except:
-                    pass
+                posted_text = card["card_date"]
 
             # Save job data
             job_data = {
@@ -385,7 +310,17 @@ def search_jobs_for_company(driver, company, titles, keywords, exclude_keywords,
 
     print(f"\n📊 SUMMARY for {company}:")
     print(f"   - Total job cards processed: {len(job_cards)}")
+    print(f"   - Scrolling stopped: {scroll_stop_reason}")
     print(f"   - Jobs matching title criteria: {len(results)}")
+    if known_job_ids is not None:
+        print(f"   - Already indexed (skipped): {skipped_known}")
+    if triage is not None:
+        triage.flush()
+        print(f"   - Skipped by triage: {skipped_triage} (logged to {triage.audit_path})")
     print(f"   - Jobs with descriptions: {sum(1 for j in results if j.get('Description'))}")
+    if page_stats is not None:
+        print(f"   - Page loads: {page_stats.summary_line(since=page_mark)}")
+    if getattr(driver, "detail_tab", None) is not None:
+        print(f"   - Detail tab: {driver.detail_tab.summary_line()}")
 
     return results
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Pre-fetch triage for Indeed job cards.
+
+Opening a detail page is the dominant cost of a scrape, and in match-all mode
+(TITLES contains "") every card gets one. The triage scores each card from its
+title, company and location alone with weighted regex rules (log-odds, squashed
+to 0..1). A card with no signal either way scores 0.5, so only cards with clear
+negative evidence (analyst, intern, engineer, ...) fall below the threshold.
+
+Skipped cards are appended to an audit CSV with their score and the rules
+that fired, so recall can be checked against later classifier runs.
+"""
+
+import os
+import re
+import math
+import datetime
+
+import pandas as pd
+
+DEFAULT_THRESHOLD = 0.35
+DEFAULT_AUDIT_PATH = os.path.join("data", "triage_skipped.csv")
+
+# (field, pattern, weight): weights are log-odds added when the pattern matches
+TRIAGE_RULES = [
+    # Seniority in the title
+    ("title", r"\b(chief|cmo|cio|ceo|coo|cfo)\b", 2.5),
+    ("title", r"\bhead of\b", 2.5),
+    ("title", r"\bmanaging director\b", 2.5),
+    ("title", r"\b(vice president|svp|evp|vp)\b", 2.0),
+    ("title", r"\bdirector\b", 2.0),
+    ("title", r"\b(national|regional) (accounts?|director)\b", 2.0),
+    ("title", r"\b(executive|principal|partner)\b", 1.0),
+    # Business area in the title
+    ("title", r"distribution|institutional|asset management|wealth|sales|client|consultant relations|marketing|"
+              r"investment|portfolio", 0.75),
+    # Junior or off-target roles
+    ("title", r"\b(intern|internship|co-op|summer analyst)\b", -4.0),
+    ("title", r"\b(analyst|associate|assistant|coordinator|specialist|representative|teller|clerk|"
+              r"administrator|trainee)\b", -2.5),
+    ("title", r"\b(engineer|developer|software|data scientist|technician)\b", -2.0),
+    ("title", r"\b(entry level|junior|jr)\b", -2.0),
+    # Company and location
+    ("company", r"asset management|investments|capital|advisors|wealth", 0.5),
+    ("location", r"\b(india|bengaluru|bangalore|hyderabad|mumbai|manila|krakow|wroclaw)\b", -1.5),
+]
+
+
+class Triage:
+    """
+    Scores job cards before their detail page is fetched.
+
+    Args:
+        threshold: Cards scoring below this are skipped
+        audit_path: CSV that skipped cards are appended to (None = don't record)
+        rules: (field, pattern, weight) tuples, field is title / company / location
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, audit_path=DEFAULT_AUDIT_PATH, rules=TRIAGE_RULES):
+        self.threshold = threshold
+        self.audit_path = audit_path
+        self.rules = [(field, re.compile(pattern, re.IGNORECASE), pattern, weight)
+                      for field, pattern, weight in rules]
+        self.skipped = []
+
+    def score(self, title, company="", location=""):
+        """
+        Returns (score, fired) where score is in 0..1 and fired lists the
+        matching rules as "field:+weight:match".
+        """
+        fields = {"title": str(title), "company": str(company), "location": str(location)}
+        logit = 0.0
+        fired = []
+
+        for field, regex, _, weight in self.rules:
+            match = regex.search(fields[field])
+            if match:
+                logit += weight
+                fired.append(f"{field}:{weight:+g}:{match.group(0).lower()}")
+
+        return 1 / (1 + math.exp(-logit)), fired
+
+    def should_fetch(self, title, company="", location="", job_url="", search_company=""):
+        """
+        Decides whether a card's detail page is worth fetching. Rejected cards
+        are kept in self.skipped until flush().
+        """
+        score, fired = self.score(title, company, location)
+        if score >= self.threshold:
+            return True, score
+
+        reason = f"score {score:.2f} < {self.threshold:.2f} ({', '.join(fired) or 'no rules fired'})"
+        self.skipped.append({
+            "Job Title": title,
+            "Company": company,
+            "Location": location,
+            "Job URL": job_url,
+            "Search Company": search_company,
+            "Triage Score": round(score, 4),
+            "Reason": reason,
+            "Skipped At": datetime.datetime.now().isoformat(timespec="seconds"),
+        })
+        return False, score
+
+    def flush(self):
+        """Appends the skipped cards to the audit CSV. Returns how many were written."""
+        count = len(self.skipped)
+        if not count or not self.audit_path:
+            self.skipped = []
+            return count
+
+        directory = os.path.dirname(self.audit_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        file_exists = os.path.isfile(self.audit_path)
+        pd.DataFrame(self.skipped).to_csv(self.audit_path, mode="a", header=not file_exists, index=False)
+        self.skipped = []
+        return count
@@ -0,0 +1,96 @@
+"""
+Wait policy for the Indeed scraper.
+
+Replaces the fixed `time.sleep(random.uniform(...))` calls with two separate
+mechanisms:
+
+1. Readiness waits: WebDriverWait on concrete DOM conditions (description
+   present, more cards loaded after a scroll). These return as soon as the
+   page is ready, so replaying local fixtures runs at I/O speed.
+2. Polite rate limiting: a minimum (jittered) interval between page
+   navigations, enforced in before_request(). Live runs keep roughly the
+   request rate of the old hardcoded sleeps.
+"""
+
+import time
+import random
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from utils_pipeline.tracing import traced
+
+
+class WaitPolicy:
+    """
+    Central timing configuration passed through the scraper functions.
+
+    Args:
+        min_request_interval: Minimum seconds between two page navigations
+        request_jitter: Extra random 0..jitter seconds added to each interval
+        page_load_timeout: Max seconds to wait for a results page to load
+        element_timeout: Max seconds to wait for a job description to appear
+        scroll_timeout: Max seconds to wait for new cards after a scroll
+        poll_frequency: Seconds between readiness checks
+    """
+
+    def __init__(self, min_request_interval=6.0, request_jitter=4.0, page_load_timeout=30,
+                 element_timeout=5, scroll_timeout=4, poll_frequency=0.25):
+        self.min_request_interval = min_request_interval
+        self.request_jitter = request_jitter
+        self.page_load_timeout = page_load_timeout
+        self.element_timeout = element_timeout
+        self.scroll_timeout = scroll_timeout
+        self.poll_frequency = poll_frequency
+        self._last_request = None
+
+    @classmethod
+    def for_fixtures(cls):
+        """No rate limiting and short timeouts, for replaying local fixture pages."""
+        return cls(min_request_interval=0, request_jitter=0, page_load_timeout=10,
+                   element_timeout=2, scroll_timeout=0.5, poll_frequency=0.05)
+
+    @traced("rate_limit_wait")
+    def before_request(self):
+        """
+        Blocks until the minimum interval since the previous navigation has
+        passed. Call immediately before every driver.get().
+        """
+        if self._last_request is not None:
+            interval = self.min_request_interval + random.uniform(0, self.request_jitter)
+            remaining = interval - (time.monotonic() - self._last_request)
+            if remaining > 0:
+                time.sleep(remaining)
+        self._last_request = time.monotonic()
+
+    @traced()
+    def wait_for_element(self, driver, css_selector, timeout=None):
+        """Waits until an element matching css_selector exists. Returns True if found."""
+        try:
+            WebDriverWait(driver, timeout or self.element_timeout, poll_frequency=self.poll_frequency).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    @traced()
+    def wait_for_more_elements(self, driver, css_selector, previous_count, timeout=None):
+        """
+        Waits until more than previous_count elements match css_selector
+        (e.g. infinite scroll appended cards). Returns the current count.
+        """
+        def count():
+            return len(driver.find_elements(By.CSS_SELECTOR, css_selector))
+
+        try:
+            WebDriverWait(driver, timeout or self.scroll_timeout, poll_frequency=self.poll_frequency).until(
+                lambda d: count() > previous_count
+            )
+        except TimeoutException:
+            pass
+        return count()
+
+
+DEFAULT_WAIT_POLICY = WaitPolicy()
@@ -0,0 +1,137 @@
+"""
+Two-stage cascade classifier: DistilBERT prefilter, then the Ollama model.
+
+Every row is first scored by the fine-tuned DistilBERT model
+(Local_LLM/train_distilbert.py). Rows whose prob_good is confidently low or
+high are labeled directly; only rows inside the uncertainty band
+[low, high) are sent to the (much slower) Gemma model. The "Decided By"
+column records which stage labeled each row.
+
+Audit a cascade run against a full-LLM run of the same postings:
+    python -m utils_llm.cascade data/indeed_jobs_..._CASCADE.csv data/full_llm_run.csv
+
+A full-LLM baseline with every row can be produced by running the cascade with
+CASCADE_BAND = (0.0, 1.01), which sends all rows to the LLM.
+"""
+
+import argparse
+import functools
+
+import pandas as pd
+
+from utils_pipeline.tracing import traced
+
+DEFAULT_BAND = (0.1, 0.9)
+STAGE_DISTILBERT = "distilbert"
+STAGE_LLM = "llm"
+STAGE_RULES = "rules"  # Rejected by the title rules before either model ran
+
+
+@functools.lru_cache(maxsize=None)
+def _load_distilbert(model_path, backend):
+    """Loads the model once per process (cascade scoring may run per chunk)."""
+    from Local_LLM.distilbert_inference import load_model
+    return load_model(model_path, backend=backend)
+
+
+@traced()
+def score_with_distilbert(df, model_path, backend="pytorch", batch_size=32):
+    """
+    Returns P(good) for every row as a Series aligned to df.index.
+    DistilBERT (and torch) are imported lazily so the pipeline does not need
+    them unless cascade mode is on.
+    """
+    from Local_LLM.distilbert_inference import build_text, predict_stream
+
+    tokenizer, model = _load_distilbert(model_path, backend)
+    probs = list(predict_stream(build_text(df), tokenizer, model, batch_size=batch_size))
+    return pd.Series(probs, index=df.index, dtype=float)
+
+
+def in_uncertainty_band(prob_good, band=DEFAULT_BAND):
+    """Boolean mask of rows that DistilBERT is not confident about."""
+    low, high = band
+    return (prob_good >= low) & (prob_good < high)
+
+
+def auto_labels(prob_good, band=DEFAULT_BAND):
+    """Labels confident rows "1" (prob >= high) or "0" (prob < low), matching the LLM's output format."""
+    return pd.Series(["1" if p >= band[1] else "0" for p in prob_good], index=prob_good.index, dtype=object)
+
+
+def _is_yes(predictions):
+    return predictions.astype(str).str.contains('1', na=False)
+
+
+def _unique_keys(df, key):
+    """Rows whose key is present, not "N/A" and not repeated (a repeated key can't be matched reliably)."""
+    keys = df[key].astype(str).str.strip()
+    usable = df[key].notna() & ~keys.isin(["", "N/A", "nan"]) & ~keys.duplicated(keep=False)
+    return df[usable]
+
+
+def cascade_report(cascade_df, baseline_df=None, key="Job URL"):
+    """
+    Prints LLM calls saved and, when a full-LLM baseline is given, how often
+    the cascade agrees with it (overall and per deciding stage).
+    """
+    total = len(cascade_df)
+    by_distilbert = int((cascade_df["Decided By"] == STAGE_DISTILBERT).sum())
+    by_rules = int((cascade_df["Decided By"] == STAGE_RULES).sum())
+    by_llm = int((cascade_df["Decided By"] == STAGE_LLM).sum())
+
+    print("\n" + "=" * 60)
+    print("🪜 CASCADE REPORT")
+    print("=" * 60)
+    print(f"Rows classified:          {total}")
+    print(f"Decided by DistilBERT:    {by_distilbert}")
+    if by_rules:
+        print(f"Rejected by title rules:  {by_rules}")
+    print(f"Sent to LLM:              {by_llm}")
+    print(f"LLM calls saved:          {(total - by_llm) / total * 100 if total else 0:.1f}%")
+
+    if baseline_df is None:
+        print("=" * 60)
+        return
+
+    cascade_keyed = _unique_keys(cascade_df, key)
+    baseline_keyed = _unique_keys(baseline_df, key)
+    skipped = (len(cascade_df) - len(cascade_keyed), len(baseline_df) - len(baseline_keyed))
+    if any(skipped):
+        print(f"\n⚠️  Not matched: {skipped[0]} cascade / {skipped[1]} baseline rows with a missing, "
+              f"'N/A' or repeated '{key}'")
+
+    merged = cascade_keyed.merge(baseline_keyed[[key, "Predicted"]], on=key, suffixes=("", "_baseline"),
+                                 validate="one_to_one")
+    if merged.empty:
+        print(f"⚠️  No rows matched the baseline on '{key}'.")
+        print("=" * 60)
+        return
+
+    cascade_yes = _is_yes(merged["Predicted"])
+    baseline_yes = _is_yes(merged["Predicted_baseline"])
+    agree = cascade_yes == baseline_yes
+
+    print(f"\nMatched with baseline:    {len(merged)} rows")
+    print(f"Overall agreement:        {agree.mean() * 100:.1f}%")
+    for stage in (STAGE_RULES, STAGE_DISTILBERT, STAGE_LLM):
+        mask = merged["Decided By"] == stage
+        if mask.any():
+            print(f"   {stage:<22} {agree[mask].mean() * 100:.1f}% of {int(mask.sum())} rows")
+
+    missed = int((baseline_yes & ~cascade_yes).sum())
+    extra = int((~baseline_yes & cascade_yes).sum())
+    print(f"Baseline '1' missed:      {missed} (of {int(baseline_yes.sum())})")
+    print(f"Extra '1' vs baseline:    {extra}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report LLM calls saved and agreement of a cascade run.")
+    parser.add_argument("cascade_csv", help="Cascade output with 'Predicted' and 'Decided By' columns")
+    parser.add_argument("baseline_csv", nargs="?", help="Full-LLM run over the same postings (optional)")
+    parser.add_argument("--key", default="Job URL", help="Column used to match rows between runs")
+    args = parser.parse_args()
+
+    baseline = pd.read_csv(args.baseline_csv) if args.baseline_csv else None
+    cascade_report(pd.read_csv(args.cascade_csv), baseline, key=args.key)
@@ -0,0 +1,151 @@
+"""
+Persistent classification cache for the Ollama job classifier.
+
+Predictions are stored in SQLite and keyed on (model name, digest of the
+Modelfile SYSTEM prompt, hash of the prompt text). The same posting scraped on
+a later day therefore maps to the same key and is answered from disk, while
+changing the model or its system prompt automatically invalidates old entries.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join("data", "classification_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 200_000
+EVICTION_CHECK_EVERY = 500  # Inserts between eviction checks
+
+_SYSTEM_BLOCK = re.compile(r'^SYSTEM\s+"""(.*?)"""', re.DOTALL | re.MULTILINE)
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def system_prompt_digest(modelfile_path=None, client=None, model_name=None):
+    """
+    Returns a digest identifying the system prompt the model runs with.
+
+    Reads the SYSTEM block from a local Modelfile when available, otherwise asks
+    the Ollama server for the model's Modelfile. Falls back to "unknown" so the
+    cache still works (keyed on model name + prompt only).
+    """
+    if modelfile_path and os.path.exists(modelfile_path):
+        with open(modelfile_path, "r", encoding="utf-8") as f:
+            modelfile = f.read()
+        match = _SYSTEM_BLOCK.search(modelfile)
+        return _sha256(match.group(1).strip() if match else modelfile)
+
+    if client is not None and model_name:
+        try:
+            return _sha256(client.show(model_name).modelfile or "")
+        except Exception as e:
+            print(f"   ⚠️ Could not read Modelfile for '{model_name}' from Ollama: {e}")
+
+    return "unknown"
+
+
+class ClassificationCache:
+    """
+    SQLite-backed prediction cache with hit/miss counters and LRU eviction
+    once the number of entries exceeds `max_entries`.
+
+    Safe to share between the classification worker threads.
+    """
+
+    def __init__(self, model_name, system_digest, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.model_name = model_name
+        self.system_digest = system_digest
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._inserts = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS predictions (
+                model TEXT NOT NULL,
+                system_digest TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                prediction TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, system_digest, prompt_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_last_used ON predictions (last_used)")
+        self._conn.commit()
+
+    def _key(self, prompt):
+        return self.model_name, self.system_digest, _sha256(prompt)
+
+    def get(self, prompt):
+        """Returns the cached prediction for `prompt`, or None on a miss."""
+        key = self._key(prompt)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT prediction FROM predictions WHERE model=? AND system_digest=? AND prompt_hash=?", key
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE predictions SET last_used=? WHERE model=? AND system_digest=? AND prompt_hash=?",
+                (time.time(), *key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, prompt, prediction):
+        """Stores a prediction. Evicts least-recently-used rows when the cache is over size."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                (*self._key(prompt), str(prediction), time.time())
+            )
+            self._conn.commit()
+
+            self._inserts += 1
+            if self._inserts % EVICTION_CHECK_EVERY == 0:
+                self._evict()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM predictions WHERE rowid IN "
+                "(SELECT rowid FROM predictions ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+            self._conn.commit()
+            print(f"   🧹 Evicted {overflow} old cache entries")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def summary(self):
+        """One-line hit/miss report."""
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0.0
+        return f"{self.hits} hits / {self.misses} misses ({rate:.1f}% hit rate), {len(self)} entries"
+
+    def close(self):
+        with self._lock:
+            self._evict()
+            self._conn.close()
@@ -0,0 +1,150 @@
+"""
+Load balancer over several Ollama servers (e.g. one instance pinned per CPU socket).
+
+ClientPool is a drop-in replacement for ollama.Client: any client method
+(generate, show, list, ...) is routed to the healthy host with the fewest
+requests in flight. A host that fails to connect, times out or returns a 5xx
+is marked down and the request fails over to the next host; a down host is
+health-checked (GET /api/tags) again after `retry_after` seconds.
+
+Routing only decides where a row runs, never what it returns: all hosts must
+serve the same model (temperature 0), and classify_rows_concurrently writes
+every result back by row position.
+
+Start extra servers with e.g. `OLLAMA_HOST=127.0.0.1:11435 ollama serve`.
+"""
+
+import time
+import functools
+import threading
+
+import httpx
+import ollama
+
+DEFAULT_RETRY_AFTER = 30  # Seconds a failed host is skipped before it is health-checked again
+
+# Errors that mean "this host is unavailable", as opposed to a bad request
+FAILOVER_ERRORS = (ConnectionError, httpx.TransportError)
+
+
+class ClientPool:
+    """
+    Least-outstanding-requests router with health checks and failover.
+
+    Args:
+        hosts: Ollama server URLs
+        request_timeout: Seconds before a single request to one host is abandoned
+        retry_after: Seconds before a failed host is tried again
+    """
+
+    def __init__(self, hosts, request_timeout=120, retry_after=DEFAULT_RETRY_AFTER):
+        if not hosts:
+            raise ValueError("ClientPool needs at least one host")
+
+        self.hosts = list(dict.fromkeys(hosts))
+        self.retry_after = retry_after
+        self._clients = {host: ollama.Client(host=host, timeout=request_timeout) for host in self.hosts}
+        self._outstanding = {host: 0 for host in self.hosts}
+        self._served = {host: 0 for host in self.hosts}
+        self._failures = {host: 0 for host in self.hosts}
+        self._down_until = {host: 0.0 for host in self.hosts}
+        self._needs_check = set()
+        self._lock = threading.Lock()
+
+        healthy = [host for host in self.hosts if self.check_health(host)]
+        print(f"🌐 Ollama pool: {len(healthy)}/{len(self.hosts)} hosts healthy")
+
+    @property
+    def clients(self):
+        return [self._clients[host] for host in self.hosts]
+
+    def _mark_down(self, host, error):
+        with self._lock:
+            self._failures[host] += 1
+            self._down_until[host] = time.monotonic() + self.retry_after
+            self._needs_check.add(host)
+        print(f"   ⚠️ Ollama host {host} unavailable ({error}); failing over for {self.retry_after}s")
+
+    def check_health(self, host):
+        """Returns True if the host answers /api/tags, marking it down otherwise."""
+        try:
+            self._clients[host].list()
+        except (ollama.ResponseError,) + FAILOVER_ERRORS as e:
+            self._mark_down(host, e)
+            return False
+
+        with self._lock:
+            self._down_until[host] = 0.0
+            self._needs_check.discard(host)
+        return True
+
+    def _acquire(self, tried):
+        """Picks the up host with the fewest in-flight requests and counts the new request against it."""
+        now = time.monotonic()
+        with self._lock:
+            untried = [h for h in self.hosts if h not in tried]
+            if not untried:
+                return None, False
+
+            candidates = [h for h in untried if self._down_until[h] <= now]
+            if not candidates:
+                # Every remaining host is down: re-check the one that failed longest ago
+                host = min(untried, key=lambda h: self._down_until[h])
+                self._outstanding[host] += 1
+                return host, True
+
+            # Ties go to the host that has served fewer requests, then to list order
+            host = min(candidates, key=lambda h: (self._outstanding[h], self._served[h], self.hosts.index(h)))
+            self._outstanding[host] += 1
+            return host, host in self._needs_check
+
+    def _release(self, host, success):
+        with self._lock:
+            self._outstanding[host] -= 1
+            if success:
+                self._served[host] += 1
+
+    def _call(self, method, *args, **kwargs):
+        tried = set()
+        last_error = None
+
+        while True:
+            host, needs_check = self._acquire(tried)
+            if host is None:
+                break
+            tried.add(host)
+
+            if needs_check and not self.check_health(host):
+                self._release(host, success=False)
+                continue
+
+            try:
+                result = getattr(self._clients[host], method)(*args, **kwargs)
+            except ollama.ResponseError as e:
+                self._release(host, success=False)
+                if e.status_code < 500:
+                    raise  # Bad request or missing model: the same on every host
+                self._mark_down(host, e)
+                last_error = e
+                continue
+            except FAILOVER_ERRORS as e:
+                self._release(host, success=False)
+                self._mark_down(host, e)
+                last_error = e
+                continue
+
+            self._release(host, success=True)
+            return result
+
+        raise ConnectionError(f"No Ollama host available (tried {len(tried)} of {len(self.hosts)}): {last_error}")
+
+    def __getattr__(self, name):
+        # Any ollama.Client method (generate, show, list, ...) is load balanced
+        if name.startswith("_") or not callable(getattr(ollama.Client, name, None)):
+            raise AttributeError(name)
+        return functools.partial(self._call, name)
+
+    def summary(self):
+        return ", ".join(
+            f"{host}: {self._served[host]} served, {self._failures[host]} failures" for host in self.hosts
+        )
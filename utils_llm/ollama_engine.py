@@ -0,0 +1,129 @@
+"""
+Concurrent classification engine for the Ollama job classifier.
+
+Rows are fanned out over a thread pool so several /api/generate requests are
+in flight at once instead of one blocking round-trip per row. The pool size is
+the hard limit on in-flight requests, and results are written back by row
+position so the output order always matches the input order.
+
+NOTE: Ollama only decodes requests in parallel when the server is started with
+OLLAMA_NUM_PARALLEL > 1 (e.g. `OLLAMA_NUM_PARALLEL=4 ollama serve`). Otherwise
+the extra requests simply queue on the server side.
+
+generate_label() is the constrained alternative to a free-form generate call:
+the answer is restricted to the JSON integers 0/1 by a format schema and
+generation stops after at most three tokens (a leading whitespace token can
+come before the digit), so each row costs a few decode steps at most.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import ollama
+import pandas as pd
+from tqdm import tqdm
+
+from utils_llm.client_pool import ClientPool, FAILOVER_ERRORS
+from utils_pipeline.tracing import traced
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REQUEST_TIMEOUT = 120  # Seconds before a single /api/generate call is abandoned
+DEFAULT_KEEP_ALIVE = "30m"     # How long Ollama keeps the model loaded after the last request
+
+# Constrained 0/1 decoding: output must be the JSON integer 0 or 1. With a format
+# schema the grammar may emit whitespace before the digit, so one token is not enough
+LABEL_FORMAT = {"type": "integer", "enum": [0, 1]}
+LABEL_OPTIONS = {"num_predict": 3, "temperature": 0}
+LABELS = ("0", "1")
+
+
+def create_client(host=None, request_timeout=DEFAULT_REQUEST_TIMEOUT, hosts=None):
+    """
+    Creates an Ollama client with a per-request timeout.
+
+    Args:
+        host: Ollama server URL (None uses OLLAMA_HOST or http://localhost:11434)
+        request_timeout: Seconds to wait for a single response before raising
+        hosts: Several server URLs to load balance over (returns a ClientPool)
+
+    Returns:
+        ollama.Client or ClientPool instance (safe to share between worker threads)
+    """
+    if hosts:
+        return ClientPool(hosts, request_timeout=request_timeout)
+    return ollama.Client(host=host, timeout=request_timeout)
+
+
+def preload_model(client, model, keep_alive=DEFAULT_KEEP_ALIVE):
+    """Loads the model into memory (an empty generate) so the first rows don't pay the load time."""
+    if isinstance(client, ClientPool):
+        # Load it on every host; unavailable hosts are skipped by the pool's routing anyway
+        for host_client in client.clients:
+            try:
+                host_client.generate(model=model, keep_alive=keep_alive)
+            except FAILOVER_ERRORS:
+                pass
+        return
+    client.generate(model=model, keep_alive=keep_alive)
+
+
+def parse_label(text):
+    """Returns "0" or "1" for an exact label, raising ValueError for anything else."""
+    label = str(text).strip()
+    if label not in LABELS:
+        raise ValueError(f"expected 0 or 1, model answered {text!r}")
+    return label
+
+
+@traced("ollama_generate")
+def generate_label(client, model, prompt, keep_alive=DEFAULT_KEEP_ALIVE):
+    """
+    Classifies a prompt with constrained 0/1 decoding (at most three tokens).
+
+    Returns:
+        "0" or "1" (raises ValueError if the server ignored the constraint)
+    """
+    response = client.generate(model=model, prompt=prompt, format=LABEL_FORMAT,
+                               options=LABEL_OPTIONS, keep_alive=keep_alive)
+    return parse_label(response["response"])
+
+
+@traced()
+def classify_rows_concurrently(rows, classify_fn, client, max_concurrency=DEFAULT_CONCURRENCY,
+                               desc="Classifying"):
+    """
+    Runs classify_fn(client, row) for every row with at most `max_concurrency`
+    requests in flight.
+
+    Args:
+        rows: List of rows (e.g. pandas Series) to classify
+        classify_fn: Callable taking (client, row) and returning the prediction
+        client: Client shared by all workers
+        max_concurrency: Maximum number of simultaneous model requests
+        desc: Progress bar label
+
+    Returns:
+        List of predictions in the same order as `rows`
+    """
+    results = [None] * len(rows)
+    if not rows:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        futures = {pool.submit(classify_fn, client, row): i for i, row in enumerate(rows)}
+
+        for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+            results[futures[future]] = future.result()
+
+    return results
+
+
+def classify_dataframe(df, classify_fn, client, max_concurrency=DEFAULT_CONCURRENCY, desc="Classifying"):
+    """
+    Classifies every row of a DataFrame concurrently.
+
+    Returns:
+        pandas Series of predictions aligned to df.index
+    """
+    rows = [row for _, row in df.iterrows()]
+    predictions = classify_rows_concurrently(rows, classify_fn, client, max_concurrency, desc)
+    return pd.Series(predictions, index=df.index, dtype=object)
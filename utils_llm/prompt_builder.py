@@ -0,0 +1,168 @@
+"""
+Shared prompt construction for the job classifier.
+
+Training-data prep (prepare_dataset.py) and every inference entry point
+(indeed_pipeline_main.py, Local_LLM/RunModel.py) build their prompts here, so
+the fine-tuned model sees the same description format in training and serving:
+
+1. Boilerplate paragraphs (EEO / legal statements, benefits blocks) are dropped
+2. Whitespace is collapsed and repeated paragraphs are removed
+3. The description is cut to DESCRIPTION_TOKEN_BUDGET tokens of the model's tokenizer
+
+The tokenizer is only loaded from local files (no network retries). Fetch it
+once with:
+    python -m utils_llm.prompt_builder --download
+or point PROMPT_TOKENIZER at a local tokenizer folder. Without a tokenizer the
+budget falls back to ~4 characters per token, loudly: prompts then differ from
+a machine that has it, so tokenizer_id() is part of the classification cache key,
+and training prep (require_tokenizer) refuses to run.
+"""
+
+import os
+import re
+import argparse
+import functools
+import threading
+
+import pandas as pd
+
+DESCRIPTION_TOKEN_BUDGET = 512  # ~2000 characters, the old training truncation
+# Un-gated copy of the Gemma 3 tokenizer (google/gemma-3-4b-it needs a licensed HF account)
+DEFAULT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "unsloth/gemma-3-4b-it")
+CHARS_PER_TOKEN = 4
+
+INFERENCE_QUESTION = "Does this job fit my criteria? Answer with 1 for yes, 0 for no."
+TRAINING_QUESTION = "Does this job fit my criteria?"
+
+# A paragraph matching any of these is boilerplate
+BOILERPLATE_PATTERNS = [
+    # EEO and legal statements
+    r"equal (employment )?opportunit",
+    r"affirmative action",
+    r"regardless of (their )?(race|age|sex|gender|religion)",
+    r"without regard to (race|age|sex|gender|religion)",
+    r"protected (veteran|characteristic|by (applicable )?law)",
+    r"reasonable accommodation",
+    r"e-verify",
+    r"pay transparency",
+    # Benefits blocks
+    r"(competitive|comprehensive|total) (rewards|benefits)",
+    r"benefits (programs?|package|include)",
+    r"401\(?k\)?",
+    r"paid time off",
+    r"(medical|dental|vision) (insurance|coverage|plans?)",
+    r"tuition (assistance|reimbursement)",
+]
+_BOILERPLATE = re.compile("|".join(BOILERPLATE_PATTERNS), re.IGNORECASE)
+_SALARY = re.compile(r"\$\s?\d")  # Pay ranges signal seniority, so their paragraphs are kept
+_WHITESPACE = re.compile(r"\s+")
+
+_tokenizer_lock = threading.Lock()
+
+
+def strip_boilerplate(description):
+    """Collapses whitespace, drops repeated and boilerplate paragraphs (one per line)."""
+    if pd.isna(description):
+        return ""
+
+    paragraphs = []
+    seen = set()
+    for line in str(description).splitlines():
+        line = _WHITESPACE.sub(" ", line).strip()
+        if line and line not in seen:
+            seen.add(line)
+            paragraphs.append(line)
+
+    kept = [p for p in paragraphs if _SALARY.search(p) or not _BOILERPLATE.search(p)]
+    # A single-paragraph description that mentions benefits is still the whole posting
+    return "\n".join(kept or paragraphs)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_tokenizer(name):
+    try:
+        from transformers import AutoTokenizer
+        # Local files only: fails at once instead of retrying downloads while holding the lock
+        return AutoTokenizer.from_pretrained(name, local_files_only=True)
+    except Exception as e:
+        print("!" * 78)
+        print(f"⚠️  TOKENIZER '{name}' NOT AVAILABLE ({type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''})")
+        print(f"   Descriptions are budgeted at ~{CHARS_PER_TOKEN} characters per token instead, so prompts")
+        print("   will NOT match those built with the tokenizer (training data, other machines).")
+        print("   Fix: python -m utils_llm.prompt_builder --download  (or set PROMPT_TOKENIZER)")
+        print("!" * 78)
+        return None
+
+
+def tokenizer_id(tokenizer_name=DEFAULT_TOKENIZER):
+    """Identifies how descriptions are budgeted: the tokenizer name, or the character fallback."""
+    with _tokenizer_lock:
+        loaded = _load_tokenizer(tokenizer_name) is not None
+    return tokenizer_name if loaded else f"chars-per-token={CHARS_PER_TOKEN}"
+
+
+def require_tokenizer(tokenizer_name=DEFAULT_TOKENIZER):
+    """Raises if the tokenizer cannot be loaded (for training data, which must match serving exactly)."""
+    with _tokenizer_lock:
+        if _load_tokenizer(tokenizer_name) is None:
+            raise RuntimeError(f"Tokenizer '{tokenizer_name}' is not available locally. "
+                               f"Run: python -m utils_llm.prompt_builder --download")
+
+
+def download_tokenizer(tokenizer_name=DEFAULT_TOKENIZER):
+    """Fetches the tokenizer files into the local Hugging Face cache."""
+    from transformers import AutoTokenizer
+    AutoTokenizer.from_pretrained(tokenizer_name)
+    _load_tokenizer.cache_clear()
+    print(f"✓ Tokenizer '{tokenizer_name}' cached locally")
+
+
+def truncate_to_tokens(text, token_budget=DESCRIPTION_TOKEN_BUDGET, tokenizer_name=DEFAULT_TOKENIZER):
+    """Cuts text after its first token_budget tokens (None = no limit)."""
+    if token_budget is None:
+        return text
+
+    # Prompts are built from several classifier threads; the Rust tokenizer is not re-entrant
+    with _tokenizer_lock:
+        tokenizer = _load_tokenizer(tokenizer_name)
+        if tokenizer is None:
+            return text[:token_budget * CHARS_PER_TOKEN]
+
+        if tokenizer.is_fast:
+            offsets = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+            if len(offsets) <= token_budget:
+                return text
+            # Cut the original string at the last kept token, so no text is re-encoded
+            return text[:offsets[token_budget - 1][1]]
+
+        tokens = tokenizer.tokenize(text)
+        if len(tokens) <= token_budget:
+            return text
+        return tokenizer.convert_tokens_to_string(tokens[:token_budget])
+
+
+def compact_description(description, token_budget=DESCRIPTION_TOKEN_BUDGET, tokenizer_name=DEFAULT_TOKENIZER):
+    """Boilerplate-free description cut to the token budget."""
+    return truncate_to_tokens(strip_boilerplate(description), token_budget, tokenizer_name)
+
+
+def build_prompt(row, question=INFERENCE_QUESTION, token_budget=DESCRIPTION_TOKEN_BUDGET):
+    """Builds the classification prompt for a single job row."""
+    return (
+        f"Job Title: {row['Job Title']}\n"
+        f"Company: {row['Company']}\n"
+        f"Location: {row['Location']}\n"
+        f"Description: {compact_description(row['Description'], token_budget)}\n"
+        f"{question}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the tokenizer used for prompt token budgets.")
+    parser.add_argument("--download", action="store_true", help="Download the tokenizer into the local HF cache")
+    parser.add_argument("--tokenizer", default=DEFAULT_TOKENIZER)
+    args = parser.parse_args()
+
+    if args.download:
+        download_tokenizer(args.tokenizer)
+    print(f"Prompt token budgets use: {tokenizer_id(args.tokenizer)}")
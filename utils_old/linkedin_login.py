@@ -5,17 +5,31 @@ from selenium.webdriver.chrome.options import Options
 import time
 import pickle
 
+from utils_pipeline.browser_resources import (PageLoadStats, DEFAULT_ALLOWLIST, content_settings_prefs,
+                                              enable_resource_blocking)
+
 load_dotenv()  # Load from .env file
 
 LINKEDIN_EMAIL = os.getenv("LINKEDIN_EMAIL")
 LINKEDIN_PASSWORD = os.getenv("LINKEDIN_PASSWORD")
 
-def init_driver(headless=False):
+def init_driver(headless=False, block_resources=False, allowlist=DEFAULT_ALLOWLIST):
+    """
+    block_resources skips images and tracking scripts (allowlisted hosts still load).
+    Page loads are measured in driver.page_stats.
+    """
     options = Options()
     if headless:
         options.add_argument("--headless")
     options.add_argument("--start-maximized")
-    return webdriver.Chrome(options=options)
+    if block_resources:
+        options.add_experimental_option("prefs", content_settings_prefs(True, allowlist))
+
+    driver = webdriver.Chrome(options=options)
+    driver.page_stats = PageLoadStats()
+    if block_resources:
+        enable_resource_blocking(driver, allowlist)
+    return driver
 
 def login_to_linkedin(driver):
     cookies_file = "linkedin_cookies.pkl"
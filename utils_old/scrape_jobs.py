@@ -5,25 +5,27 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import random
 
+from utils_pipeline.title_rules import TitleRules
+from utils_pipeline.tracing import span
+from utils_pipeline.browser_resources import record_page_load
+from utils_pipeline.detail_tab import detail_tab
+from utils_pipeline.scroll_stop import MarginalMatchStop, DEFAULT_MIN_MATCH_RATE
+
 
 def extract_job_description(driver, job_url):
     """
-    Opens a job posting in a new tab and extracts the 'About the job' text and posting date.
+    Loads a job posting in the driver's persistent detail tab and extracts the 'About the job' text and posting date.
     Returns tuple: (description_text, posted_date)
     """
     description_text = ""
     posted_date = "N/A"
-    original_window = driver.current_window_handle
-    new_window = None
 
-    try:
-        # Open job in new tab
-        driver.execute_script("window.open(arguments[0]);", job_url)
-        time.sleep(2)
+    # One reused tab for all postings (no tab open/close per job)
+    tab = detail_tab(driver)
 
-        # Switch to the new tab
-        new_window = driver.window_handles[-1]
-        driver.switch_to.window(new_window)
+    try:
+        tab.navigate(job_url)
+        record_page_load(driver, "viewjob")
         time.sleep(3)
 
         # Try multiple selectors for the description
@@ -121,34 +123,14 @@ def extract_job_description(driver, job_url):
     except Exception as e:
         print(f"   ❌ Error extracting job description: {e}")
     finally:
-        # CRITICAL: Always ensure we're back on the original tab
-        try:
-            # Close the new tab if it exists
-            if new_window and new_window in driver.window_handles:
-                driver.switch_to.window(new_window)
-                driver.close()
-
-            # Switch back to original window
-            if original_window in driver.window_handles:
-                driver.switch_to.window(original_window)
-            else:
-                # Fallback: switch to first available window
-                driver.switch_to.window(driver.window_handles[0])
-
-            time.sleep(0.5)
-
-        except Exception as e:
-            print(f"   ⚠️ Error managing tabs: {e}")
-            try:
-                if len(driver.window_handles) > 0:
-                    driver.switch_to.window(driver.window_handles[0])
-            except:
-                pass
+        # CRITICAL: Always ensure we're back on the results tab
+        tab.return_home()
 
     return description_text, posted_date
 
 
-def improved_scroll_and_load(driver, target_jobs=15, max_scroll_attempts=20):
+def improved_scroll_and_load(driver, target_jobs=15, max_scroll_attempts=20, title_rules=None,
+                             min_match_rate=DEFAULT_MIN_MATCH_RATE):
     """
     IMPROVED: Aggressive scrolling with job clicking to trigger LinkedIn's lazy loading.
     This is the most reliable method for LinkedIn's current implementation.
@@ -156,9 +138,19 @@ def improved_scroll_and_load(driver, target_jobs=15, max_scroll_attempts=20):
     Args:
         target_jobs: Number of jobs we want to load (default: 15)
         max_scroll_attempts: Maximum scroll iterations (default: 20)
+        title_rules: TitleRules of the search; when given, scrolling stops once fewer than
+                     min_match_rate of the newly loaded cards pass the title filter
+
+    Returns:
+        tuple: (jobs loaded, reason scrolling stopped)
     """
     print(f"\n🔄 Starting IMPROVED scroll to load {target_jobs} jobs...")
 
+    match_stop = (MarginalMatchStop(title_rules, CARD_SELECTORS, TITLE_SELECTORS, min_match_rate)
+                  if title_rules is not None else None)
+    if match_stop is not None and not match_stop.enabled:
+        match_stop = None  # Match-all rules only: nothing to measure the rate with
+
     def count_visible_jobs():
         """Count currently visible job cards"""
         return len(
@@ -177,6 +169,14 @@ def improved_scroll_and_load(driver, target_jobs=15, max_scroll_attempts=20):
     print(f"   Initial jobs loaded: {previous_count}")
 
     stagnant_count = 0
+    stop_reason = f"max scroll attempts ({max_scroll_attempts}) reached"
+
+    if match_stop is not None:
+        match_stop.update(driver)
+        if match_stop.stop_reason():
+            stop_reason = match_stop.stop_reason()
+            print(f"   🛑 Not scrolling: {stop_reason}")
+            return previous_count, stop_reason
 
     for attempt in range(max_scroll_attempts):
         # Strategy 1: Click on the last visible job (triggers loading)
@@ -236,12 +236,22 @@ def improved_scroll_and_load(driver, target_jobs=15, max_scroll_attempts=20):
         current_count = count_visible_jobs()
         new_jobs = current_count - previous_count
 
-        print(f"   Scroll #{attempt + 1}: {current_count} jobs visible (+{new_jobs} new)")
+        matches = ""
+        if match_stop is not None:
+            new_titled, new_matches = match_stop.update(driver)
+            matches = f", {new_matches}/{new_titled} new titles match"
+        print(f"   Scroll #{attempt + 1}: {current_count} jobs visible (+{new_jobs} new{matches})")
 
         # Check if we've reached target
         if current_count >= target_jobs:
             print(f"\n✅ Target reached! {current_count} jobs loaded")
-            return current_count
+            return current_count, "target reached"
+
+        # Check if the newly loaded cards are still worth scrolling for
+        if match_stop is not None and match_stop.stop_reason():
+            stop_reason = match_stop.stop_reason()
+            print(f"   🛑 Stopping scroll: {stop_reason}")
+            break
 
         # Check if we're stuck
         if current_count == previous_count:
@@ -265,6 +275,7 @@ def improved_scroll_and_load(driver, target_jobs=15, max_scroll_attempts=20):
                     stagnant_count = 0
                 elif stagnant_count >= 5:
                     print(f"   ⚠️ Stuck at {current_count} jobs, stopping scroll")
+                    stop_reason = f"stuck at {current_count} jobs after {stagnant_count} attempts"
                     break
         else:
             stagnant_count = 0
@@ -272,12 +283,144 @@ def improved_scroll_and_load(driver, target_jobs=15, max_scroll_attempts=20):
         previous_count = current_count
 
     final_count = count_visible_jobs()
-    print(f"\n📊 Scroll complete: {final_count} jobs loaded (target was {target_jobs})")
-    return final_count
+    print(f"\n📊 Scroll complete: {final_count} jobs loaded (target was {target_jobs}; {stop_reason})")
+    return final_count, stop_reason
+
+
+# Card, title, company and link selectors, tried in order (first hit wins)
+CARD_SELECTORS = [
+    "li[data-occludable-job-id]",
+    "[data-job-id]",
+    ".jobs-search-results__list-item",
+    ".base-card",
+    ".job-card-container",
+]
+TITLE_SELECTORS = [
+    "h3.base-search-card__title a span[aria-hidden='true']",
+    "h3 a span[title]",
+    ".base-search-card__title a",
+    ".job-card-list__title a",
+    "h3 a span:first-child",
+    ".jobs-unified-top-card__job-title",
+    "a[data-tracking-control-name='public_jobs_jserp-result_search-card'] span[aria-hidden='true']"
+]
+COMPANY_SELECTORS = [
+    "h4.base-search-card__subtitle",  # Most common for company
+    ".base-search-card__subtitle a",
+    "a.hidden-nested-link",
+    "span.job-card-container__primary-description"
+]
+LINK_SELECTORS = [
+    "a[href*='/jobs/view/']",
+    ".base-card__full-link",
+    "[data-job-id] a"
+]
+
+# Runs in the browser: walks the cards once and returns plain data, so the
+# per-card find_element / .text calls (one WebDriver round-trip each) are gone
+EXTRACT_CARDS_JS = """
+const [cardSelectors, titleSelectors, companySelectors, linkSelectors, maxCards] = arguments;
+const text = el => ((el && el.innerText) || "").trim();
+
+let cards = [];
+let used = null;
+for (const sel of cardSelectors) {
+    cards = Array.from(document.querySelectorAll(sel));
+    if (cards.length) { used = sel; break; }
+}
+
+return [used, cards.slice(0, maxCards).map(card => {
+    let title = "";
+    for (const sel of titleSelectors) {
+        const t = text(card.querySelector(sel));
+        if (t) { title = t; break; }
+    }
+
+    const companies = [];
+    for (const sel of companySelectors) {
+        const el = card.querySelector(sel);
+        if (el) companies.push([sel, text(el)]);
+    }
+
+    let url = null;
+    for (const sel of linkSelectors) {
+        const a = card.querySelector(sel);
+        if (a && a.href) { url = a.href; break; }
+    }
+
+    const lines = text(card).split("\\n").map(l => l.trim()).filter(l => l);
+    return {title: title, companies: companies, url: url, lines: lines};
+})];
+"""
+
+COMPANY_METADATA_WORDS = ['ago', 'hour', 'day', 'week', 'month', 'applicant', 'reposted', 'promoted', 'be an early']
+LINE_METADATA_WORDS = ['ago', 'hour', 'day', 'week', 'month', '$', 'applicant',
+                       'reposted', 'promoted', 'viewed', 'verification']
+LOCATION_METADATA_WORDS = ['viewed', 'ago', 'hour', 'day', 'week', 'month', '$', 'applicant']
+
+
+def extract_cards(driver, max_results):
+    """
+    Returns (selector used, list of card dicts) from a single execute_script call.
+    Each card has: title, companies ([selector, text] pairs), url and lines (non-empty text lines).
+    """
+    selector, cards = driver.execute_script(
+        EXTRACT_CARDS_JS, CARD_SELECTORS, TITLE_SELECTORS, COMPANY_SELECTORS, LINK_SELECTORS, max_results
+    )
+    return selector, cards or []
+
+
+def pick_company(card, title_text):
+    """Company name from the card's company elements, else from its text lines ("N/A" if none fit)."""
+    # Strategy 1: Specific company selectors (avoiding title elements)
+    for company_sel, extracted_company in card["companies"]:
+        # Make sure it's not the title and not metadata
+        if (extracted_company and
+                extracted_company.lower() != title_text.lower() and
+                not any(word in extracted_company.lower() for word in COMPANY_METADATA_WORDS)):
+            print(f"   ✓ Extracted company using selector '{company_sel}': {extracted_company}")
+            return extracted_company
+
+    # Strategy 2: Parse from card text structure
+    card_lines = card["lines"]
+    print(f"   📋 Card lines for debugging: {card_lines[:6]}")
+
+    # Company name is typically the line immediately after the title
+    if title_text in card_lines:
+        title_idx = card_lines.index(title_text)
+        if title_idx + 1 < len(card_lines):
+            potential_company = card_lines[title_idx + 1]
+
+            # Validate it's not location, date, or other metadata (location has a comma)
+            if (',' not in potential_company and
+                    not any(word in potential_company.lower() for word in LINE_METADATA_WORDS)):
+                print(f"   ✓ Parsed company from line after title: {potential_company}")
+                return potential_company
+
+    # If still not found, look for first non-title, non-location line
+    for line in card_lines[1:6]:
+        if (line != title_text and
+                ',' not in line and
+                not any(word in line.lower() for word in LINE_METADATA_WORDS + ['easy apply'])):
+            print(f"   ✓ Parsed company from first valid line: {line}")
+            return line
+
+    return "N/A"
+
+
+def pick_location(card_lines, title_text, company_text):
+    """First "City, State"-like line after the title that is not metadata ("N/A" if none)."""
+    for line in card_lines[1:6]:
+        if line != title_text and line != company_text:
+            # Location usually has a comma (city, state)
+            if ',' in line and not any(word in line.lower() for word in LOCATION_METADATA_WORDS):
+                print(f"   ✓ Found location: {line}")
+                return line
+    return "N/A"
 
 
 def search_jobs_for_company(driver, company, titles, keywords, max_results=15, use_ai_search=False, max_descriptions=10,
-                            location="United States", use_interactive_scroll=False):
+                            location="United States", use_interactive_scroll=False, exclude_keywords=()):
     """
     Search for jobs at a specific company and filter by titles
 
@@ -292,6 +435,7 @@ def search_jobs_for_company(driver, company, titles, keywords, max_results=15, u
                          Set to None to extract all descriptions
         location: Location filter for job search (default: "United States")
         use_interactive_scroll: DEPRECATED - now uses improved scroll by default
+        exclude_keywords: Title phrases that reject a card (e.g. ["intern", "analyst"])
 
     Returns:
         List of job dictionaries with job information
@@ -310,7 +454,12 @@ def search_jobs_for_company(driver, company, titles, keywords, max_results=15, u
     print(f"Location: {location}")
     print(f"Using {'AI' if use_ai_search else 'Regular'} search mode")
     print(f"Using exact company match with quotes: \"{company}\"")
+
+    page_stats = getattr(driver, "page_stats", None)
+    page_mark = page_stats.mark() if page_stats is not None else 0
+
     driver.get(search_url)
+    record_page_load(driver, "search")
 
     # Wait for page to load
     try:
@@ -322,31 +471,23 @@ def search_jobs_for_company(driver, company, titles, keywords, max_results=15, u
 
     time.sleep(3)
 
-    # STEP 1: SCROLL TO LOAD JOBS (using improved method)
-    total_loaded = improved_scroll_and_load(driver, target_jobs=max_results, max_scroll_attempts=20)
-
-    # STEP 2: NOW get all the job cards
-    selectors = [
-        "li[data-occludable-job-id]",
-        "[data-job-id]",
-        ".jobs-search-results__list-item",
-        ".base-card",
-        ".job-card-container",
-    ]
-
-    job_cards = []
-    for selector in selectors:
-        job_cards = driver.find_elements(By.CSS_SELECTOR, selector)
-        if job_cards:
-            print(f"Found {len(job_cards)} job cards using selector: {selector}")
-            break
+    # Include/exclude phrases compiled once for all cards of this search
+    title_rules = TitleRules(titles, exclude_keywords)
+
+    # STEP 1: SCROLL TO LOAD JOBS (using improved method, stops early once new cards stop matching)
+    total_loaded, scroll_stop_reason = improved_scroll_and_load(driver, target_jobs=max_results,
+                                                                max_scroll_attempts=20, title_rules=title_rules)
+
+    # STEP 2: Read every card in ONE execute_script round-trip, then apply the
+    # title/company/location heuristics in Python on the returned data
+    with span("extract_cards_js"):
+        selector, job_cards = extract_cards(driver, max_results)
 
     if not job_cards:
         print("❌ No job cards found.")
         return []
 
-    # Limit to max_results
-    job_cards = job_cards[:max_results]
+    print(f"Found job cards using selector: {selector}")
     print(f"Processing {len(job_cards)} job cards (limited to max_results={max_results})\n")
 
     results = []
@@ -355,163 +496,39 @@ def search_jobs_for_company(driver, company, titles, keywords, max_results=15, u
     # STEP 3: Process all loaded job cards
     for i, card in enumerate(job_cards):
         try:
-            # Extract job title
-            title_text = ""
-            title_selectors = [
-                "h3.base-search-card__title a span[aria-hidden='true']",
-                "h3 a span[title]",
-                ".base-search-card__title a",
-                ".job-card-list__title a",
-                "h3 a span:first-child",
-                ".jobs-unified-top-card__job-title",
-                "a[data-tracking-control-name='public_jobs_jserp-result_search-card'] span[aria-hidden='true']"
-            ]
-
-            for title_sel in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, title_sel)
-                    title_text = title_elem.text.strip()
-                    if title_text:
-                        break
-                except:
-                    continue
-
-            if not title_text:
-                card_text = card.text.strip()
-                if card_text:
-                    title_text = card_text.split('\n')[0]
+            card_lines = card["lines"]
 
+            # Job title: first title selector with text, else the first line of the card
+            title_text = card["title"] or (card_lines[0] if card_lines else "")
             if not title_text:
                 continue
 
-            # Title matching logic
-            title_lower = title_text.lower()
-            title_match = False
-
-            if "" in titles or any(not t.strip() for t in titles):
-                title_match = True
+            # Title matching logic (exclusions first, one compiled regex each)
+            verdict = title_rules.evaluate(title_text)
+            if verdict.kind == "exclude":
+                print(f"   ✗ Excluded by keyword '{verdict.rule}': '{title_text}'")
+                continue
+            if verdict.kind == "match-all":
                 print(f"   ✓ Match all mode enabled - accepting: '{title_text}'")
+            elif verdict.accepted:
+                print(f"   ✓ Title match found: '{verdict.rule}' in '{title_text}'")
             else:
-                for target_title in titles:
-                    target_title_clean = target_title.strip().lower()
-                    if target_title_clean and target_title_clean in title_lower:
-                        title_match = True
-                        print(f"   ✓ Title match found: '{target_title}' in '{title_text}'")
-                        break
-
-            if not title_match:
                 print(f"   ✗ No title match for: '{title_text}'")
                 continue
 
-            # Extract company name from job card
-            company_text = "N/A"
-
-            # Strategy 1: Try specific company selectors (avoiding title elements)
-            company_selectors = [
-                "h4.base-search-card__subtitle",  # Most common for company
-                ".base-search-card__subtitle a",
-                "a.hidden-nested-link",
-                "span.job-card-container__primary-description"
-            ]
-
-            for company_sel in company_selectors:
-                try:
-                    company_elem = card.find_element(By.CSS_SELECTOR, company_sel)
-                    extracted_company = company_elem.text.strip()
-
-                    # Make sure it's not the title and not metadata
-                    if (extracted_company and
-                            extracted_company != title_text and
-                            extracted_company.lower() != title_text.lower() and
-                            not any(word in extracted_company.lower() for word in
-                                    ['ago', 'hour', 'day', 'week', 'month', 'applicant',
-                                     'reposted', 'promoted', 'be an early'])):
-                        company_text = extracted_company
-                        print(f"   ✓ Extracted company using selector '{company_sel}': {company_text}")
-                        break
-                except:
-                    continue
-
-            # Strategy 2: Parse from card text structure
-            if company_text == "N/A":
-                try:
-                    card_lines = [line.strip() for line in card.text.split('\n') if line.strip()]
-                    print(f"   📋 Card lines for debugging: {card_lines[:6]}")
-
-                    # Company name is typically the line immediately after the title
-                    # Find the title line index first
-                    title_idx = -1
-                    for idx, line in enumerate(card_lines):
-                        if line == title_text:
-                            title_idx = idx
-                            break
-
-                    if title_idx != -1 and title_idx + 1 < len(card_lines):
-                        potential_company = card_lines[title_idx + 1]
-
-                        # Validate it's not location, date, or other metadata
-                        if (potential_company and
-                                ',' not in potential_company and  # Location has comma
-                                not any(word in potential_company.lower() for word in
-                                        ['ago', 'hour', 'day', 'week', 'month', '$', 'applicant',
-                                         'reposted', 'promoted', 'viewed', 'verification'])):
-                            company_text = potential_company
-                            print(f"   ✓ Parsed company from line after title: {company_text}")
-
-                    # If still not found, look for first non-title, non-location line
-                    if company_text == "N/A":
-                        for line in card_lines[1:6]:
-                            if (line and
-                                    line != title_text and
-                                    ',' not in line and
-                                    not any(word in line.lower() for word in
-                                            ['ago', 'hour', 'day', 'week', 'month', '$', 'applicant',
-                                             'reposted', 'promoted', 'viewed', 'verification', 'easy apply'])):
-                                company_text = line
-                                print(f"   ✓ Parsed company from first valid line: {company_text}")
-                                break
-
-                except Exception as e:
-                    print(f"   ⚠️ Could not parse company from card text: {e}")
+            company_text = pick_company(card, title_text)
 
             # Last resort: use the search company parameter
             if company_text == "N/A":
                 company_text = company
                 print(f"   ⚠️ Using search company as fallback: {company_text}")
 
-            # Extract location
-            location_text = "N/A"
-            try:
-                card_lines = [line.strip() for line in card.text.split('\n') if line.strip()]
-
-                for idx, line in enumerate(card_lines[1:6], start=1):
-                    if line and line != title_text and line != company_text:
-                        # Location usually has a comma (city, state)
-                        if ',' in line and not any(word in line.lower() for word in
-                                                   ['viewed', 'ago', 'hour', 'day', 'week', 'month', '$', 'applicant']):
-                            location_text = line
-                            print(f"   ✓ Found location: {location_text}")
-                            break
-            except:
-                pass
+            location_text = pick_location(card_lines, title_text, company_text)
 
             # Extract posted date
             posted_text = "N/A"
 
-            # Extract job URL
-            job_url = "N/A"
-            for link_sel in [
-                "a[href*='/jobs/view/']",
-                ".base-card__full-link",
-                "[data-job-id] a"
-            ]:
-                try:
-                    link_elem = card.find_element(By.CSS_SELECTOR, link_sel)
-                    job_url = link_elem.get_attribute("href")
-                    if job_url:
-                        break
-                except:
-                    continue
+            job_url = card["url"] or "N/A"
 
             # Extract Job Description and Date
             description_text = ""
@@ -545,7 +562,12 @@ def search_jobs_for_company(driver, company, titles, keywords, max_results=15, u
 
     print(f"\n📊 SUMMARY for {company}:")
     print(f"   - Total job cards processed: {len(job_cards)}")
+    print(f"   - Scrolling stopped: {scroll_stop_reason}")
     print(f"   - Jobs matching title criteria: {len(results)}")
     print(f"   - Jobs with descriptions: {sum(1 for j in results if j.get('Description'))}")
+    if page_stats is not None:
+        print(f"   - Page loads: {page_stats.summary_line(since=page_mark)}")
+    if getattr(driver, "detail_tab", None) is not None:
+        print(f"   - Detail tab: {driver.detail_tab.summary_line()}")
 
     return results
\ No newline at end of file
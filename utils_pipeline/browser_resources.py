@@ -0,0 +1,173 @@
+"""
+Resource blocking and page-load accounting for the Selenium scrapers.
+
+The scrapers only read text, yet every page load also pulls images, web fonts,
+video and tracking scripts. With blocking enabled (init_driver(block_resources=True)):
+
+- Images are switched off with Chrome's content-settings preference, with an
+  exception for every allowlisted host (e.g. the Cloudflare / captcha challenge)
+- Tracker hosts are blocked with the DevTools Protocol (Network.setBlockedURLs),
+  skipping any pattern that matches an allowlisted host
+
+Network.setBlockedURLs cannot tell which page or host asked for a resource, so
+an extension pattern such as "*.woff" would also block the fonts and audio of a
+bot challenge. Fonts and media are therefore only blocked on request
+(kinds=["font", "media", "tracking"]), with no allowlist protection.
+
+Network.setBlockedURLs applies to one tab, so the scrapers call
+apply_to_current_tab() after opening a detail tab.
+
+Every driver from init_driver also gets a PageLoadStats (driver.page_stats),
+filled from the browser's Performance API after each page load, so bytes
+transferred and load times can be compared with blocking on and off.
+"""
+
+import fnmatch
+import statistics
+
+# Blocked through the DevTools Protocol (wildcard URL patterns)
+BLOCKED_URL_PATTERNS = {
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg"],
+    "tracking": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*connect.facebook.net*",
+        "*bat.bing.com*",
+        "*hotjar.com*",
+        "*px.ads.linkedin.com*",
+        "*snap.licdn.com*",
+        "*analytics.tiktok.com*",
+    ],
+}
+
+# Blocked by default: host patterns the allowlist can be checked against
+DEFAULT_BLOCKED_KINDS = ("tracking",)
+
+# Hosts that always load in full: blocking parts of a bot challenge breaks it
+DEFAULT_ALLOWLIST = [
+    "challenges.cloudflare.com",
+    "hcaptcha.com",
+    "recaptcha.net",
+    "www.google.com/recaptcha",
+    "www.gstatic.com/recaptcha",
+]
+
+# Runs in the page after a load: totals from the Performance API. transferSize is
+# 0 for cross-origin resources without Timing-Allow-Origin and for cache hits,
+# so bytes are a lower bound (comparable between runs of the same pages)
+PAGE_METRICS_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+let bytes = nav ? nav.transferSize : 0;
+for (const r of resources) bytes += r.transferSize || 0;
+return {
+    bytes: bytes,
+    resources: resources.length,
+    dom_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null,
+    load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd - nav.startTime : null,
+};
+"""
+
+
+def blocked_url_patterns(allowlist=DEFAULT_ALLOWLIST, kinds=DEFAULT_BLOCKED_KINDS):
+    """
+    CDP URL patterns for the given resource kinds, minus any that would block
+    an allowlisted host (patterns are matched against https://<host>/ URLs).
+    """
+    patterns = []
+    for kind, kind_patterns in BLOCKED_URL_PATTERNS.items():
+        if kind in kinds:
+            patterns.extend(kind_patterns)
+    allowed_urls = [f"https://{host.rstrip('/')}/" for host in allowlist]
+    return [p for p in patterns if not any(fnmatch.fnmatch(url, p) for url in allowed_urls)]
+
+
+def content_settings_prefs(block_images, allowlist=DEFAULT_ALLOWLIST):
+    """
+    Chrome preferences that turn images off (2) or on (1). Written into the
+    persistent profile, so they are always set explicitly: a profile last used
+    with blocking must load images again when blocking is off.
+    """
+    prefs = {"profile.default_content_setting_values.images": 2 if block_images else 1}
+    if block_images:
+        prefs["profile.content_settings.exceptions.images"] = {
+            f"[*.]{host.split('/')[0]},*": {"setting": 1} for host in allowlist
+        }
+    return prefs
+
+
+def enable_resource_blocking(driver, allowlist=DEFAULT_ALLOWLIST, kinds=DEFAULT_BLOCKED_KINDS):
+    """Starts blocking on the driver's current tab and remembers the patterns for new tabs."""
+    driver.blocked_url_patterns = blocked_url_patterns(allowlist, kinds)
+    apply_to_current_tab(driver)
+    print(f"🚫 Blocking {len(driver.blocked_url_patterns)} resource patterns "
+          f"(allowlist: {', '.join(allowlist) or 'none'})")
+
+
+def apply_to_current_tab(driver):
+    """Re-applies the driver's blocked patterns to the tab it is switched to (no-op without blocking)."""
+    patterns = getattr(driver, "blocked_url_patterns", None)
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        print(f"   ⚠️ Could not apply resource blocking to this tab: {e}")
+
+
+class PageLoadStats:
+    """
+    Bytes transferred and load times per page load, grouped by page type
+    (e.g. "search", "viewjob").
+    """
+
+    def __init__(self):
+        self.pages = []
+
+    def record(self, driver, page):
+        """Reads the Performance API totals of the page the driver just loaded. Returns the metrics dict."""
+        try:
+            metrics = driver.execute_script(PAGE_METRICS_JS) or {}
+        except Exception:
+            return {}
+        metrics["page"] = page
+        self.pages.append(metrics)
+        return metrics
+
+    def mark(self):
+        """Position to pass to summary_line(since=...) for the pages loaded after this call."""
+        return len(self.pages)
+
+    def summary_line(self, since=0):
+        return _summarize(self.pages[since:])
+
+    def print_summary(self):
+        print("\n🌐 Page loads:")
+        if not self.pages:
+            print("   (no pages measured)")
+            return
+        for page in sorted({p["page"] for p in self.pages}):
+            print(f"   {page:<10} {_summarize([p for p in self.pages if p['page'] == page])}")
+        print(f"   {'total':<10} {self.summary_line()}")
+
+
+def _summarize(pages):
+    if not pages:
+        return "no pages measured"
+    total_bytes = sum(p.get("bytes") or 0 for p in pages)
+    load_times = [p["load_ms"] for p in pages if p.get("load_ms")]
+    median_load = f"{statistics.median(load_times) / 1000:.2f}s" if load_times else "n/a"
+    return (f"{len(pages)} pages, {total_bytes / 1e6:.2f} MB transferred "
+            f"({total_bytes / len(pages) / 1e3:.0f} KB/page), median load {median_load}")
+
+
+def record_page_load(driver, page):
+    """Records the current page in driver.page_stats (if the driver has one). Returns the metrics dict."""
+    stats = getattr(driver, "page_stats", None)
+    if stats is None:
+        return {}
+    return stats.record(driver, page)
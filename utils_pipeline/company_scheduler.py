@@ -0,0 +1,229 @@
+"""
+Orders and sizes the company crawl by historical yield.
+
+Yield is good jobs (classified "1") per browser-minute, from the artifacts
+earlier pipeline runs left behind:
+
+- data/runs/*.jsonl      which job keys each search company returned (company_done)
+- data/traces/*.jsonl    browser time per company (search_company spans)
+- the cumulative CSV and data/*_CLASSIFIED.csv   which jobs were classified "1"
+
+Yields are smoothed towards the overall rate (as if every company had PRIOR_MINUTES
+of average history), so a company with little or no history is neither dropped
+nor put first. Companies are crawled best-first; their result / description
+budgets scale with yield relative to the average, and lower-ranked companies are
+cut back when the estimated run time exceeds the global time budget.
+
+Show the current plan:
+    python -m utils_pipeline.company_scheduler --budget 90
+"""
+
+import os
+import glob
+import json
+import argparse
+from collections import namedtuple
+
+import pandas as pd
+
+from utils_indeed.job_index import extract_job_key
+from utils_pipeline.run_journal import DEFAULT_RUNS_DIR
+from utils_pipeline.tracing import DEFAULT_TRACE_DIR
+
+DEFAULT_CLASSIFIED_GLOBS = [os.path.join("data", "indeed_jobs_cumulative.csv"),
+                            os.path.join("data", "*_CLASSIFIED.csv")]
+
+DEFAULT_RESULTS = 20             # Budget of an average-yield company (the old fixed max_results)
+MIN_RESULTS = 5                  # Every company is still searched, so its yield keeps being measured
+MAX_RESULTS = 60
+PRIOR_MINUTES = 5.0              # Weight of the overall rate in each company's smoothed yield
+DEFAULT_MINUTES_PER_SEARCH = 3.0  # Browser minutes of a DEFAULT_RESULTS search when there is no trace history
+
+# One scheduled company: crawl position is the list order
+CompanyPlan = namedtuple("CompanyPlan", [
+    "company", "max_results", "max_descriptions",
+    "yield_per_minute", "good_jobs", "browser_minutes", "est_minutes",
+])
+
+
+def _read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line from a crash
+
+
+def _journaled_job_keys(runs_dir):
+    """{search company: set of job keys it returned} over every journaled run."""
+    keys = {}
+    for path in glob.glob(os.path.join(runs_dir, "*.jsonl")):
+        for event in _read_jsonl(path):
+            if event.get("event") == "company_done":
+                keys.setdefault(event["company"], set()).update(event.get("job_keys") or [])
+    return keys
+
+
+def _browser_minutes(trace_dir):
+    """
+    {search company: (browser minutes, searches, results budgeted)} from search_company spans.
+    Spans recorded before the scheduler existed carry no max_results; those searches ran DEFAULT_RESULTS.
+    """
+    totals = {}
+    for path in glob.glob(os.path.join(trace_dir, "*.jsonl")):
+        for record in _read_jsonl(path):
+            attrs = record.get("attrs") or {}
+            company = attrs.get("company")
+            if record.get("name") == "search_company" and company:
+                minutes, searches, results = totals.get(company, (0.0, 0, 0))
+                totals[company] = (minutes + record["duration"] / 60, searches + 1,
+                                   results + int(attrs.get("max_results") or DEFAULT_RESULTS))
+    return totals
+
+
+def _good_jobs(classified_globs):
+    """DataFrame (Job URL, Company) of every job ever classified as relevant."""
+    frames = []
+    for pattern in classified_globs:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                df = pd.read_csv(path, usecols=lambda c: c in ("Job URL", "Company", "Predicted"))
+            except (ValueError, pd.errors.EmptyDataError):
+                continue
+            if "Predicted" in df.columns:
+                df = df[df["Predicted"].astype(str).str.contains("1", na=False)]
+            frames.append(df.reindex(columns=["Job URL", "Company"]))
+
+    if not frames:
+        return pd.DataFrame(columns=["Job URL", "Company"])
+    return pd.concat(frames, ignore_index=True).drop_duplicates(subset=["Job URL"])
+
+
+def load_company_history(companies, runs_dir=DEFAULT_RUNS_DIR, trace_dir=DEFAULT_TRACE_DIR,
+                         classified_globs=DEFAULT_CLASSIFIED_GLOBS):
+    """
+    Per-company history for the given search companies.
+
+    Good jobs are attributed through the journaled job keys of each search;
+    a company without journals falls back to matching the posting's Company
+    column by name.
+
+    Returns:
+        DataFrame indexed by company with columns good_jobs, scraped_jobs, browser_minutes, searches,
+        results_budgeted (sum of max_results over those searches)
+    """
+    journaled = _journaled_job_keys(runs_dir)
+    minutes = _browser_minutes(trace_dir)
+    good = _good_jobs(classified_globs)
+    good_keys = set(good["Job URL"].map(extract_job_key).dropna())
+    good_companies = good["Company"].fillna("").astype(str).str.lower()
+
+    rows = []
+    for company in companies:
+        keys = journaled.get(company, set())
+        if company in journaled:
+            good_jobs = len(keys & good_keys)
+        else:
+            good_jobs = int(good_companies.str.contains(company.lower(), regex=False).sum())
+        browser_minutes, searches, results_budgeted = minutes.get(company, (0.0, 0, 0))
+        rows.append({
+            "company": company,
+            "good_jobs": good_jobs,
+            "scraped_jobs": len(keys),
+            "browser_minutes": browser_minutes,
+            "searches": searches,
+            "results_budgeted": results_budgeted,
+        })
+
+    return pd.DataFrame(rows).set_index("company")
+
+
+def plan_companies(companies, history, time_budget_minutes=None, default_results=DEFAULT_RESULTS,
+                   min_results=MIN_RESULTS, max_results=MAX_RESULTS, prior_minutes=PRIOR_MINUTES):
+    """
+    Orders companies by smoothed yield and sizes each one's budgets.
+
+    Args:
+        companies: Search companies (ties keep this order)
+        history: load_company_history() output
+        time_budget_minutes: Estimated browser minutes the whole crawl may take (None = no limit)
+        default_results: max_results of an average-yield company
+
+    Returns:
+        list of CompanyPlan, in crawl order
+    """
+    history = history.reindex(companies).fillna(0)
+    measured = history[history["searches"] > 0]
+
+    total_minutes = history["browser_minutes"].sum()
+    overall_rate = history["good_jobs"].sum() / total_minutes if total_minutes else 0.0
+    # Minutes per budgeted result: searches ran with different max_results once scheduled
+    minutes_per_result = ((measured["browser_minutes"] / measured["results_budgeted"]).median()
+                          if not measured.empty else DEFAULT_MINUTES_PER_SEARCH / default_results)
+
+    smoothed = ((history["good_jobs"] + overall_rate * prior_minutes) /
+                (history["browser_minutes"] + prior_minutes))
+    mean_yield = smoothed.mean()
+
+    order = sorted(companies, key=lambda c: -smoothed[c])  # Stable: ties keep list order
+    remaining = time_budget_minutes
+    plans = []
+
+    for company in order:
+        row = history.loc[company]
+        weight = smoothed[company] / mean_yield if mean_yield > 0 else 1.0
+        results = int(min(max(round(default_results * weight), min_results), max_results))
+
+        # A company's past minutes per budgeted result, times the planned result count
+        per_result = (row["browser_minutes"] / row["results_budgeted"] if row["results_budgeted"]
+                      else minutes_per_result)
+
+        if remaining is not None:
+            affordable = int(remaining / per_result) if per_result > 0 else results
+            results = max(min(results, affordable), min_results)
+
+        est_minutes = results * per_result
+        if remaining is not None:
+            remaining = max(remaining - est_minutes, 0.0)
+
+        plans.append(CompanyPlan(
+            company=company,
+            max_results=results,
+            max_descriptions=results,
+            yield_per_minute=float(smoothed[company]),
+            good_jobs=int(row["good_jobs"]),
+            browser_minutes=float(row["browser_minutes"]),
+            est_minutes=float(est_minutes),
+        ))
+
+    return plans
+
+
+def list_order_plan(companies, results=DEFAULT_RESULTS):
+    """Unscheduled crawl: companies in list order, the same budgets for each."""
+    return [CompanyPlan(company, results, results, 0.0, 0, 0.0, 0.0) for company in companies]
+
+
+def print_plan(plans, time_budget_minutes=None):
+    print("\n📅 Company schedule (by historical yield):")
+    print(f"   {'#':>3}  {'company':<32}{'good':>6}{'minutes':>9}{'yield/min':>11}{'results':>9}{'est min':>9}")
+    for i, plan in enumerate(plans, start=1):
+        print(f"   {i:>3}  {plan.company[:31]:<32}{plan.good_jobs:>6}{plan.browser_minutes:>9.1f}"
+              f"{plan.yield_per_minute:>11.3f}{plan.max_results:>9}{plan.est_minutes:>9.1f}")
+    total = sum(plan.est_minutes for plan in plans)
+    budget = f" of {time_budget_minutes:.0f} budgeted" if time_budget_minutes else ""
+    print(f"   Estimated browser time: {total:.1f} min{budget}")
+
+
+if __name__ == "__main__":
+    from indeed_pipeline_main import COMPANIES
+
+    parser = argparse.ArgumentParser(description="Show the yield-based company schedule for the next run.")
+    parser.add_argument("--budget", type=float, help="Global time budget in minutes")
+    parser.add_argument("--runs-dir", default=DEFAULT_RUNS_DIR)
+    parser.add_argument("--trace-dir", default=DEFAULT_TRACE_DIR)
+    args = parser.parse_args()
+
+    history = load_company_history(COMPANIES, args.runs_dir, args.trace_dir)
+    print_plan(plan_companies(COMPANIES, history, args.budget), args.budget)
@@ -0,0 +1,111 @@
+"""
+One persistent tab for job detail pages.
+
+Opening and closing a tab per posting costs a renderer process spin-up, handle
+switching and a teardown sleep on every job, and lets Chrome's memory drift
+upwards over a long run. Instead, each driver keeps a single secondary tab
+that is navigated in place for every job URL:
+
+    tab = detail_tab(driver)
+    try:
+        tab.navigate(job_url)      # switches to the detail tab and loads the job
+        ...read the page...
+    finally:
+        tab.return_home()          # back to the results tab
+
+If the detail tab was closed or its renderer crashed, navigate() opens a new
+one and retries the load once.
+"""
+
+from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+
+from utils_pipeline.browser_resources import apply_to_current_tab
+
+
+class DetailTab:
+    """
+    Persistent secondary tab of a driver (create it with detail_tab(driver)).
+
+    Attributes:
+        opened: Tabs created so far (1 for a run without crashes)
+        recoveries: Times a dead tab was replaced
+        loads: Job pages loaded
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.handle = None
+        self.home = None
+        self.opened = 0
+        self.recoveries = 0
+        self.loads = 0
+
+    def _open(self):
+        self.driver.switch_to.new_window("tab")
+        self.handle = self.driver.current_window_handle
+        apply_to_current_tab(self.driver)  # Resource blocking is per tab
+        self.opened += 1
+
+    def _discard(self, reason):
+        print(f"   ⚠️ Detail tab lost ({reason}); opening a new one")
+        self.recoveries += 1
+        try:
+            if self.handle in self.driver.window_handles:
+                self.driver.switch_to.window(self.handle)
+                self.driver.close()
+        except WebDriverException:
+            pass
+        self.handle = None
+        self.return_home()
+
+    def _switch(self):
+        current = self.driver.current_window_handle
+        if current == self.handle:
+            return
+        self.home = current
+
+        if self.handle is None:
+            self._open()
+        elif self.handle not in self.driver.window_handles:
+            self._discard("tab was closed")
+            self._open()
+        else:
+            self.driver.switch_to.window(self.handle)
+
+    def navigate(self, url):
+        """Switches to the detail tab (opening or replacing it if needed) and loads url there."""
+        for attempt in (1, 2):
+            try:
+                self._switch()
+                self.driver.get(url)
+                self.loads += 1
+                return
+            except WebDriverException as e:
+                dead = isinstance(e, NoSuchWindowException) or "crash" in str(e).lower()
+                if attempt == 2 or not dead:
+                    raise
+                self._discard(str(e).splitlines()[0] if str(e) else type(e).__name__)
+
+    def return_home(self):
+        """Switches back to the tab that was active before navigate() (or any other live tab)."""
+        try:
+            handles = self.driver.window_handles
+            if self.home in handles:
+                self.driver.switch_to.window(self.home)
+                return
+            others = [h for h in handles if h != self.handle]
+            if others:
+                self.driver.switch_to.window(others[0])
+        except WebDriverException as e:
+            print(f"   ⚠️ Could not return to the results tab: {e}")
+
+    def summary_line(self):
+        return f"{self.loads} job pages in {self.opened} tab(s), {self.recoveries} recoveries"
+
+
+def detail_tab(driver):
+    """The driver's DetailTab, created on first use."""
+    tab = getattr(driver, "detail_tab", None)
+    if tab is None:
+        tab = driver.detail_tab = DetailTab(driver)
+    return tab
@@ -0,0 +1,192 @@
+"""
+Partitioned Parquet store for scraped job postings.
+
+Every scraped batch is written as one Parquet file in a hive-partitioned
+dataset (`data/job_store/scrape_date=<YYYY-MM-DD>/Company=<company>/<run>__<search company>.parquet`):
+- Company comes back from the partition path as a dictionary column
+- Location and the other short text columns are dictionary-encoded
+- Description is zstd-compressed
+
+Readers only decode the columns they ask for, and filters on scrape_date /
+Company skip whole directories before any file is opened:
+    from utils_pipeline.job_store import JobStore
+    store = JobStore()
+    df = store.read(columns=["Job Title", "Company"], filters=[("Company", "==", "Fidelity")])
+
+CSV export for Excel:
+    python -m utils_pipeline.job_store export data/fidelity.csv --company Fidelity --since 2025-01-01
+"""
+
+import os
+import glob
+import argparse
+import datetime
+import urllib.parse
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+import pandas as pd
+
+DEFAULT_STORE_DIR = os.path.join("data", "job_store")
+
+# Column order of the scraped CSVs (kept for reads and CSV exports)
+JOB_COLUMNS = ["Job Title", "Company", "Location", "Posted Date", "Job URL", "Description"]
+DICTIONARY_COLUMNS = ["Job Title", "Location", "Posted Date", "Run"]
+
+
+class JobStore:
+    """
+    Hive-partitioned Parquet dataset of scraped jobs.
+
+    Each row also carries the run it was scraped in ("Run", the raw CSV's base
+    name), when its batch was written ("Scraped At") and its position in that
+    batch ("Row Seq"), so a run can be read back in scrape order even though a
+    batch is split across company partitions.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is not installed. Install it with: pip install pyarrow")
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _partition_dir(self, scrape_date, company):
+        return os.path.join(
+            self.root,
+            f"scrape_date={scrape_date}",
+            f"Company={urllib.parse.quote(str(company), safe='')}"
+        )
+
+    def _batch_filename(self, run, search_company):
+        return f"{run}__{urllib.parse.quote(str(search_company), safe='')}.parquet"
+
+    def write_batch(self, jobs, run, search_company, scrape_date=None):
+        """
+        Writes one batch of job dicts (as returned by search_jobs_for_company).
+        Files are keyed on the run and the search that produced them, inside
+        the partition of each card's company: a later search returning cards
+        of an already stored company adds a file instead of replacing it, and
+        re-scraping a search after a crash replaces only its own files.
+
+        Returns:
+            int: Number of rows written
+        """
+        if not jobs:
+            return 0
+
+        scrape_date = scrape_date or datetime.date.today().isoformat()
+        df = pd.DataFrame(jobs).fillna("").astype(str)  # Missing fields stay empty, not "None" / "nan"
+        df["Run"] = run
+        df["Scraped At"] = datetime.datetime.now().isoformat()
+        df["Row Seq"] = range(len(df))
+
+        written = 0
+        for company, group in df.groupby("Company", sort=False):
+            directory = self._partition_dir(scrape_date, company)
+            os.makedirs(directory, exist_ok=True)
+
+            # Partition columns live in the path, not in the file
+            table = pa.Table.from_pandas(group.drop(columns=["Company"]), preserve_index=False)
+            compression = {name: ("zstd" if name == "Description" else "snappy") for name in table.column_names}
+
+            path = os.path.join(directory, self._batch_filename(run, search_company))
+            tmp_path = path + ".tmp"
+            pq.write_table(table, tmp_path, compression=compression,
+                           use_dictionary=[c for c in DICTIONARY_COLUMNS if c in table.column_names])
+            os.replace(tmp_path, path)  # Atomic: readers never see a half-written batch
+            written += len(group)
+
+        return written
+
+    def discard_run(self, run, keep_companies=()):
+        """
+        Deletes a run's batches except those written by the searches in
+        keep_companies (search company names, e.g. a journal's finished companies).
+        """
+        keep = {self._batch_filename(run, c) for c in keep_companies}
+        for path in glob.glob(os.path.join(self.root, "scrape_date=*", "Company=*", f"{run}__*.parquet")):
+            if os.path.basename(path) not in keep:
+                os.remove(path)
+
+    def dataset(self):
+        return ds.dataset(
+            self.root,
+            format=ds.ParquetFileFormat(read_options=ds.ParquetReadOptions(dictionary_columns={"Location"})),
+            partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+            exclude_invalid_files=True
+        )
+
+    def read(self, columns=None, filters=None):
+        """
+        Reads jobs as a DataFrame.
+
+        Args:
+            columns: Columns to load (default: all)
+            filters: pyarrow expression or DNF list like [("Company", "==", "Fidelity")],
+                     pushed down to partition pruning and row-group statistics
+        """
+        if not glob.glob(os.path.join(self.root, "scrape_date=*", "Company=*", "*.parquet")):
+            return pd.DataFrame(columns=columns or JOB_COLUMNS)
+
+        if isinstance(filters, list):
+            filters = pq.filters_to_expression(filters)
+
+        table = self.dataset().to_table(columns=columns, filter=filters)
+        df = table.to_pandas()
+
+        ordered = [c for c in JOB_COLUMNS if c in df.columns]
+        return df[ordered + [c for c in df.columns if c not in ordered]]
+
+    def read_run(self, run, columns=None):
+        """Returns a run's jobs in scrape order with only the scraped CSV columns."""
+        columns = columns or JOB_COLUMNS
+        order = ["Scraped At", "Row Seq"]
+        if not glob.glob(os.path.join(self.root, "scrape_date=*", "Company=*", "*.parquet")):
+            return pd.DataFrame(columns=columns)
+        if "Row Seq" not in self.dataset().schema.names:
+            order = ["Scraped At"]  # Store written before rows carried their batch position
+
+        df = self.read(columns=columns + order, filters=[("Run", "==", run)])
+        df = df.sort_values(order, kind="stable").reset_index(drop=True)
+        return df[columns]
+
+    def export_csv(self, path, columns=None, filters=None):
+        """Exports matching jobs to a CSV (e.g. for Excel users)."""
+        df = self.read(columns=columns, filters=filters)
+        df.to_csv(path, index=False)
+        print(f"📤 Exported {len(df)} jobs to {path}")
+        return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or export the Parquet job store.")
+    parser.add_argument("command", choices=["export", "summary"])
+    parser.add_argument("output", nargs="?", help="CSV path for export")
+    parser.add_argument("--root", default=DEFAULT_STORE_DIR)
+    parser.add_argument("--company", help="Only jobs from this company")
+    parser.add_argument("--since", help="Only jobs scraped on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--columns", nargs="+", help="Columns to include")
+    args = parser.parse_args()
+
+    store = JobStore(args.root)
+    filters = []
+    if args.company:
+        filters.append(("Company", "==", args.company))
+    if args.since:
+        filters.append(("scrape_date", ">=", args.since))
+
+    if args.command == "export":
+        if not args.output:
+            parser.error("export needs an output CSV path")
+        store.export_csv(args.output, columns=args.columns, filters=filters or None)
+    else:
+        df = store.read(columns=["Company", "scrape_date"], filters=filters or None)
+        print(f"🗃️  {len(df)} jobs in {args.root}")
+        if not df.empty:
+            print(df.groupby(["scrape_date", "Company"], observed=True).size().to_string())
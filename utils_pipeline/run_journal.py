@@ -0,0 +1,187 @@
+"""
+Crash-safe, append-only journal for a single pipeline run.
+
+Each run writes `data/runs/<run_id>.jsonl`, one JSON event per line. Phase
+events are fsync'd as they are written; per-row `classified` events are
+group-committed (every SYNC_EVERY records or SYNC_INTERVAL seconds), so a crash
+loses at most that tail, whose rows are simply classified again on resume
+(mostly from the classification cache):
+
+    start           raw CSV path chosen for the run
+    schedule        company crawl plan (order + budgets) and the run's time budget
+    company_done    company finished: job keys scraped, raw CSV size after saving, search minutes
+    scrape_done     scraping phase finished
+    classified      row hash -> prediction for one classified row
+    batch_failed    a streaming batch could not be classified (company, job count, error)
+    classify_done   classification phase finished
+
+`python indeed_pipeline_main.py --resume <run_id>` replays the journal: finished
+companies are skipped, the journaled crawl plan is replayed (with the time
+budget minus the minutes already spent searching), the raw CSV is truncated back to the last journaled size
+(dropping a half-saved batch), and journaled predictions are reused instead of
+calling the model again, so the final CSVs match an uninterrupted run. A run
+whose classification already finished is not classified again.
+"""
+
+import os
+import json
+import hashlib
+import datetime
+import threading
+import time
+
+DEFAULT_RUNS_DIR = os.path.join("data", "runs")
+
+SYNC_EVERY = 200     # classified records between fsyncs
+SYNC_INTERVAL = 5.0  # ...or seconds, whichever comes first
+
+# Columns that identify a scraped row (used for classified-row hashes)
+ROW_HASH_COLUMNS = ["Job Title", "Company", "Location", "Posted Date", "Job URL", "Description"]
+
+
+def row_hash(row):
+    """Stable hash of a scraped job row's content."""
+    values = "\x1f".join(str(row.get(col, "")) for col in ROW_HASH_COLUMNS)
+    return hashlib.sha256(values.encode("utf-8")).hexdigest()
+
+
+class RunJournal:
+    """
+    Append-only event log for one run. Loading an existing journal rebuilds
+    the progress state; a torn last line from a crash is ignored.
+    """
+
+    def __init__(self, run_id, directory=DEFAULT_RUNS_DIR):
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{run_id}.jsonl")
+        os.makedirs(directory, exist_ok=True)
+
+        self.raw_csv = None
+        self.schedule = None  # list of plan dicts, in crawl order
+        self.time_budget_minutes = None
+        self.spent_minutes = 0.0
+        self.completed_companies = {}  # company -> raw CSV size in bytes after its batch
+        self.scraped_job_keys = set()
+        self.scrape_finished = False
+        self.predictions = {}  # row hash -> prediction
+        self.classify_finished = False
+        self.classified_output = None
+        self.failed_batches = []  # batch_failed events of the streaming classifier
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        if os.path.exists(self.path):
+            self._load()
+
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    @classmethod
+    def new(cls, directory=DEFAULT_RUNS_DIR):
+        run_id = datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S")
+        return cls(run_id, directory)
+
+    @classmethod
+    def resume(cls, run_id, directory=DEFAULT_RUNS_DIR):
+        if not os.path.exists(os.path.join(directory, f"{run_id}.jsonl")):
+            raise FileNotFoundError(f"❌ No journal found for run '{run_id}' in {directory}")
+        return cls(run_id, directory)
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn write from a crash
+                self._apply(event)
+
+    def _apply(self, event):
+        kind = event.get("event")
+        if kind == "start":
+            self.raw_csv = event["raw_csv"]
+        elif kind == "schedule":
+            self.schedule = event["plans"]
+            self.time_budget_minutes = event.get("time_budget_minutes")
+        elif kind == "company_done":
+            self.completed_companies[event["company"]] = event["raw_csv_bytes"]
+            self.spent_minutes += event.get("minutes", 0.0)
+            self.scraped_job_keys.update(event.get("job_keys", []))
+        elif kind == "scrape_done":
+            self.scrape_finished = True
+        elif kind == "classified":
+            self.predictions[event["row_hash"]] = event["prediction"]
+        elif kind == "batch_failed":
+            self.failed_batches.append(event)
+        elif kind == "classify_done":
+            self.classify_finished = True
+            self.classified_output = event.get("output")
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def record(self, event, sync=True, **fields):
+        """
+        Appends one event. With sync (the default) it is forced to disk before
+        returning; otherwise it is written with the next group commit.
+        """
+        entry = {"event": event, "time": datetime.datetime.now().isoformat(timespec="seconds"), **fields}
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._apply(entry)
+            self._unsynced += 1
+            if (sync or self._unsynced >= SYNC_EVERY
+                    or time.monotonic() - self._last_sync >= SYNC_INTERVAL):
+                self._sync()
+
+    def start(self, raw_csv):
+        if self.raw_csv is None:
+            self.record("start", raw_csv=raw_csv)
+
+    def schedule_planned(self, plans, time_budget_minutes):
+        """Journals the crawl plan (dicts or namedtuples) once, so a resumed run replays it."""
+        if self.schedule is None:
+            plans = [p._asdict() if hasattr(p, "_asdict") else dict(p) for p in plans]
+            self.record("schedule", plans=plans, time_budget_minutes=time_budget_minutes)
+
+    def company_done(self, company, job_keys, raw_csv_bytes, minutes=0.0):
+        self.record("company_done", company=company, job_keys=sorted(k for k in job_keys if k),
+                    raw_csv_bytes=raw_csv_bytes, minutes=round(minutes, 4))
+
+    def scrape_done(self):
+        self.record("scrape_done")
+
+    def classified(self, row_hash_value, prediction):
+        self.record("classified", sync=False, row_hash=row_hash_value, prediction=prediction)
+
+    def batch_failed(self, company, jobs, error):
+        self.record("batch_failed", company=company, jobs=jobs, error=error)
+
+    def classify_done(self, output):
+        self.record("classify_done", output=output)
+
+    def restore_raw_csv(self):
+        """
+        Truncates the raw CSV to its size after the last journaled company, so
+        a batch saved just before a crash is not duplicated on resume.
+        """
+        if not self.raw_csv or not os.path.exists(self.raw_csv):
+            return
+
+        size = max(self.completed_companies.values(), default=0)
+        if os.path.getsize(self.raw_csv) > size:
+            with open(self.raw_csv, "r+b") as f:
+                f.truncate(size)
+            print(f"✂️  Trimmed unjournaled rows from {self.raw_csv} (back to {size} bytes)")
+
+        if size == 0:
+            os.remove(self.raw_csv)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
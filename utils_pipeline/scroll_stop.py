@@ -0,0 +1,122 @@
+"""
+Adaptive stop for infinite-scroll result lists.
+
+Scrolling used to continue until a raw card count was reached, even when every
+newly loaded card was a junior posting the title filter would reject. After each
+scroll, MarginalMatchStop reads the titles of only the cards that appeared since
+the last check (one execute_script call), runs the compiled TitleRules on them,
+and asks the scroll loop to stop once the match rate of the most recent `window`
+titled cards falls below `min_match_rate`.
+
+The rate is measured with the non-empty include phrases only (TitleRules.targeted()).
+In match-all mode (TITLES contains "") every non-excluded card would count as a
+match and the stop could never fire; a card that no include phrase names is
+exactly the long tail the stop is meant to cut. Without any include phrase the
+stop is disabled (see disabled_reason()).
+"""
+
+from collections import deque
+
+DEFAULT_MIN_MATCH_RATE = 0.1  # Stop when fewer than 1 in 10 recent cards pass the title filter
+DEFAULT_WINDOW = 15           # Recent titled cards the rate is measured over (about one scroll's worth)
+
+# Titles of the cards from index `start` on, using the first card selector that has matches.
+# Virtualized (occluded) cards have no title yet and come back as ""
+NEW_CARD_TITLES_JS = """
+const [cardSelectors, titleSelectors, start] = arguments;
+let cards = [];
+for (const sel of cardSelectors) {
+    cards = Array.from(document.querySelectorAll(sel));
+    if (cards.length) break;
+}
+return cards.slice(start).map(card => {
+    for (const sel of titleSelectors) {
+        const el = card.querySelector(sel);
+        const text = el ? (el.innerText || el.getAttribute("title") || "").trim() : "";
+        if (text) return text;
+    }
+    return "";
+});
+"""
+
+
+class MarginalMatchStop:
+    """
+    Tracks the title-match rate of newly loaded cards during one scroll session.
+
+    Args:
+        title_rules: Compiled TitleRules of the search (its include phrases are
+                     used even in match-all mode)
+        card_selectors: Card CSS selectors, first with matches wins
+        title_selectors: Title CSS selectors inside a card, first with text wins
+        min_match_rate: Stop once the recent match rate is below this
+        window: Number of most recent titled cards the rate is measured over
+    """
+
+    def __init__(self, title_rules, card_selectors, title_selectors,
+                 min_match_rate=DEFAULT_MIN_MATCH_RATE, window=DEFAULT_WINDOW):
+        self.title_rules = title_rules.targeted()
+        self.card_selectors = list(card_selectors)
+        self.title_selectors = list(title_selectors)
+        self.min_match_rate = min_match_rate
+        self.window = window
+        self.seen = 0
+        self.titled = 0
+        self.matched = 0
+        self.recent = deque(maxlen=window)
+
+    @property
+    def enabled(self):
+        return self.title_rules is not None
+
+    def update(self, driver):
+        """Evaluates the cards loaded since the last call. Returns (new titled cards, of which matching)."""
+        if not self.enabled:
+            return 0, 0
+        try:
+            titles = driver.execute_script(NEW_CARD_TITLES_JS, self.card_selectors, self.title_selectors,
+                                           self.seen) or []
+        except Exception:
+            return 0, 0
+
+        # Untitled (occluded) cards are re-read on the next call instead of being skipped
+        loaded = len(titles)
+        while loaded and not titles[loaded - 1]:
+            loaded -= 1
+        titles = titles[:loaded]
+        self.seen += loaded
+
+        new_titled = new_matches = 0
+        for title in titles:
+            if not title:
+                continue
+            accepted = self.title_rules.evaluate(title).accepted
+            self.recent.append(accepted)
+            new_titled += 1
+            new_matches += accepted
+
+        self.titled += new_titled
+        self.matched += new_matches
+        return new_titled, new_matches
+
+    @property
+    def recent_rate(self):
+        return sum(self.recent) / len(self.recent) if self.recent else None
+
+    def stop_reason(self):
+        """A reason string once the recent match rate is below the threshold, else None."""
+        if not self.enabled:
+            return None
+        if len(self.recent) < self.window or self.recent_rate >= self.min_match_rate:
+            return None
+        return (f"marginal title-match rate {self.recent_rate:.0%} over the last {self.window} cards "
+                f"< {self.min_match_rate:.0%} ({self.matched}/{self.titled} matched overall)")
+
+
+def disabled_reason(title_rules):
+    """Why scrolling can never stop early with these rules (None when the stop is active)."""
+    if title_rules is None:
+        return "no title rules"
+    if title_rules.targeted() is None:
+        return "no non-empty include phrase to measure the match rate with"
+    return None
@@ -0,0 +1,121 @@
+"""
+Compiled include/exclude rule engine for job titles.
+
+The include phrases (TITLES) and exclude phrases (EXCLUDE_KEYWORDS) are each
+compiled into one case-insensitive regex alternation, longest phrase first, so
+a title is checked against every phrase in a single scan instead of a Python
+loop per phrase. Phrases match as substrings, like the old `phrase in title`
+checks ("intern" also excludes "Interns - Wealth" and "International Sales
+Director"). TitleRules(..., whole_words=True) matches whole words only instead.
+
+The same rules run per card while scraping (evaluate) and vectorized over a
+DataFrame column before classification (evaluate_series). Both report which
+rule fired.
+"""
+
+import re
+from collections import namedtuple
+
+import pandas as pd
+
+MATCH_ALL = "match-all"
+
+# accepted: bool, kind: "exclude" / "include" / "match-all" / "no-match", rule: the phrase that fired
+RuleMatch = namedtuple("RuleMatch", ["accepted", "kind", "rule"])
+
+
+def _compile(phrases, whole_words=False):
+    """One regex for all phrases; returns (regex or None, {lowercased match: original phrase})."""
+    cleaned = {}
+    for phrase in phrases:
+        phrase = str(phrase).strip()
+        if phrase:
+            cleaned.setdefault(phrase.lower(), phrase)
+
+    if not cleaned:
+        return None, cleaned
+
+    # Longest first, so "head of distribution" is reported rather than "head of"
+    alternation = "|".join(re.escape(p) for p in sorted(cleaned, key=len, reverse=True))
+    if whole_words:
+        alternation = rf"(?<!\w)(?:{alternation})(?!\w)"
+    return re.compile(alternation, re.IGNORECASE), cleaned
+
+
+class TitleRules:
+    """
+    Args:
+        include: Title phrases to accept. An empty phrase ("") or an empty list
+                 means match-all mode (every non-excluded title is accepted).
+        exclude: Phrases that reject a title; exclusion wins over inclusion.
+        whole_words: Match phrases as whole words only ("intern" no longer hits
+                     "Interns" or "International"). Off by default: phrases
+                     match anywhere in the title, as substrings.
+    """
+
+    def __init__(self, include=(), exclude=(), whole_words=False):
+        include = list(include)
+        self.include = include
+        self.exclude = list(exclude)
+        self.match_all = not include or any(not str(p).strip() for p in include)
+        self.whole_words = whole_words
+        self._include, self._include_phrases = _compile(include, whole_words)
+        self._exclude, self._exclude_phrases = _compile(exclude, whole_words)
+
+    def targeted(self):
+        """
+        The same rules without match-all: only the non-empty include phrases
+        accept a title. None when there are no such phrases.
+        """
+        phrases = [p for p in self.include if str(p).strip()]
+        if not phrases:
+            return None
+        return TitleRules(phrases, self.exclude, whole_words=self.whole_words)
+
+    def evaluate(self, title):
+        """Checks a single title (e.g. one scraped card)."""
+        title = "" if pd.isna(title) else str(title)
+
+        if self._exclude is not None:
+            match = self._exclude.search(title)
+            if match:
+                return RuleMatch(False, "exclude", self._exclude_phrases[match.group(0).lower()])
+
+        if self.match_all:
+            return RuleMatch(True, MATCH_ALL, None)
+
+        if self._include is not None:
+            match = self._include.search(title)
+            if match:
+                return RuleMatch(True, "include", self._include_phrases[match.group(0).lower()])
+
+        return RuleMatch(False, "no-match", None)
+
+    def _extract(self, titles, regex, phrases):
+        if regex is None:
+            return pd.Series(None, index=titles.index, dtype=object)
+        matched = titles.str.extract(f"({regex.pattern})", flags=re.IGNORECASE)[0]
+        return matched.str.lower().map(phrases)
+
+    def evaluate_series(self, titles):
+        """
+        Vectorized evaluate() over a column of titles.
+
+        Returns:
+            DataFrame aligned to titles.index with columns
+            "accepted" (bool) and "rule" (e.g. "exclude:intern", "include:director", "match-all", "no-match")
+        """
+        titles = titles.fillna("").astype(str)
+        excluded_by = self._extract(titles, self._exclude, self._exclude_phrases)
+        included_by = self._extract(titles, self._include, self._include_phrases)
+
+        excluded = excluded_by.notna()
+        if self.match_all:
+            accepted = ~excluded
+            rule = pd.Series(MATCH_ALL, index=titles.index, dtype=object)
+        else:
+            accepted = ~excluded & included_by.notna()
+            rule = ("include:" + included_by).fillna("no-match")
+        rule = rule.where(~excluded, "exclude:" + excluded_by)
+
+        return pd.DataFrame({"accepted": accepted.astype(bool), "rule": rule}, index=titles.index)
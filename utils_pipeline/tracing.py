@@ -0,0 +1,184 @@
+"""
+Lightweight span tracing for the scraper, pipeline and classifiers.
+
+Code marks stages with `span(name, **attrs)` or `@traced()`. While a trace is
+active (start_trace), every finished span is appended to a JSONL file:
+
+    {"name": "extract_job_description", "start": 1731.2, "duration": 3.41,
+     "parent": "company", "thread": "MainThread", "status": "ok",
+     "attrs": {"company": "Fidelity"}}
+
+Attributes are inherited by nested spans on the same thread, so a "company"
+span around a search tags every page load, scroll and detail fetch inside it.
+With no active trace, span() and @traced() cost a single check.
+
+Summarize a trace (p50 / p95 / total per stage and per company):
+    python -m utils_pipeline.tracing data/traces/<run-id>.jsonl
+"""
+
+import os
+import json
+import time
+import argparse
+import functools
+import threading
+import contextlib
+
+import pandas as pd
+
+DEFAULT_TRACE_DIR = os.path.join("data", "traces")
+
+_lock = threading.Lock()
+_local = threading.local()
+_trace_file = None
+
+
+def start_trace(path):
+    """Starts writing spans to path (appending). Returns the path."""
+    global _trace_file
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with _lock:
+        if _trace_file is not None:
+            _trace_file.close()
+        _trace_file = open(path, "a", encoding="utf-8")
+    return path
+
+
+def stop_trace():
+    global _trace_file
+    with _lock:
+        if _trace_file is not None:
+            _trace_file.close()
+            _trace_file = None
+
+
+def _write(record):
+    line = json.dumps(record, default=str) + "\n"
+    with _lock:
+        if _trace_file is not None:
+            _trace_file.write(line)
+            _trace_file.flush()
+
+
+@contextlib.contextmanager
+def span(name, **attrs):
+    """
+    Times the enclosed block as one span. Yields the span's attribute dict, so
+    results can be attached before it closes:
+
+        with span("company", company=company) as attrs:
+            jobs = search(...)
+            attrs["jobs"] = len(jobs)
+    """
+    if _trace_file is None:
+        yield attrs
+        return
+
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+
+    merged = dict(stack[-1][1]) if stack else {}
+    merged.update(attrs)
+    stack.append((name, merged))
+
+    start_wall = time.time()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield merged
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        stack.pop()
+        _write({
+            "name": name,
+            "start": round(start_wall, 6),
+            "duration": round(duration, 6),
+            "parent": stack[-1][0] if stack else None,
+            "thread": threading.current_thread().name,
+            "status": status,
+            "attrs": merged,
+        })
+
+
+def traced(name=None):
+    """Decorator that records every call of the function as a span (default name: function name)."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _trace_file is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def load_trace(path):
+    """Reads a JSONL trace into a DataFrame with one row per span (attributes flattened)."""
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line from a crash
+            record.update(record.pop("attrs", {}) or {})
+            records.append(record)
+    return pd.DataFrame(records)
+
+
+def summarize_trace(path, top_stages=8):
+    """Prints p50 / p95 / total seconds per stage, and total seconds per company for the busiest stages."""
+    df = load_trace(path)
+
+    print("\n" + "=" * 78)
+    print(f"⏱️  TRACE SUMMARY: {path}")
+    print("=" * 78)
+    if df.empty:
+        print("(no spans recorded)")
+        print("=" * 78)
+        return
+
+    wall = (df["start"] + df["duration"]).max() - df["start"].min()
+    stats = df.groupby("name")["duration"].agg(
+        calls="count",
+        p50="median",
+        p95=lambda d: d.quantile(0.95),
+        total="sum",
+    ).sort_values("total", ascending=False)
+
+    print(f"Wall time: {wall:.1f}s\n")
+    print(f"{'stage':<28}{'calls':>7}{'p50 (s)':>10}{'p95 (s)':>10}{'total (s)':>12}{'% wall':>9}")
+    print("-" * 78)
+    for stage, row in stats.iterrows():
+        share = row["total"] / wall * 100 if wall else 0.0
+        print(f"{stage:<28}{int(row['calls']):>7}{row['p50']:>10.3f}{row['p95']:>10.3f}{row['total']:>12.1f}{share:>9.1f}")
+
+    if "company" in df.columns and df["company"].notna().any():
+        stages = [s for s in stats.index if s in set(df.loc[df["company"].notna(), "name"])][:top_stages]
+        per_company = df[df["company"].notna() & df["name"].isin(stages)].pivot_table(
+            index="company", columns="name", values="duration", aggfunc="sum", fill_value=0.0
+        )[stages]
+        print("\nTotal seconds per company:")
+        print(per_company.round(1).to_string())
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a JSONL span trace.")
+    parser.add_argument("trace", help="Trace file, e.g. data/traces/<run-id>.jsonl")
+    parser.add_argument("--top-stages", type=int, default=8, help="Stages shown in the per-company table")
+    args = parser.parse_args()
+
+    summarize_trace(args.trace, top_stages=args.top_stages)